@@ -5,6 +5,8 @@ from __future__ import annotations
 import random
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from backend.ai.pathfinding import find_path
 from backend.world.grid import Position
 
@@ -77,16 +79,17 @@ async def _wander(creature: Creature, game_state: GameState) -> None:
     # TODO: actions like walking should incorporate personality
     # ie). lazy guy will walk slowly, very motivated energetic fast but burns energy
 
-    # Try random directions
-    candidates = []
-    for dx in range(-3, 4):
-        for dy in range(-3, 4):
-            nx, ny = pos.x + dx, pos.y + dy
-            if world.is_walkable(nx, ny, pos.z) and (dx != 0 or dy != 0):
-                candidates.append(Position(nx, ny, pos.z))
-
-    if candidates:
-        target = random.choice(candidates)
+    # Walkable tiles within 3 in each direction, excluding our own tile
+    x0, y0 = max(0, pos.x - 3), max(0, pos.y - 3)
+    ys, xs = np.nonzero(world.walk_mask[pos.z, y0:pos.y + 4, x0:pos.x + 4])
+    xs += x0
+    ys += y0
+    others = (xs != pos.x) | (ys != pos.y)
+    xs, ys = xs[others], ys[others]
+
+    if len(xs):
+        i = random.randrange(len(xs))
+        target = Position(int(xs[i]), int(ys[i]), pos.z)
         path = await find_path(pos, target, world, max_iterations=200)
         if path and len(path) > 1:
             creature.current_path = path
@@ -1,15 +1,298 @@
-"""Async A* pathfinding on the 3D world grid."""
+"""Async A* pathfinding on the 3D world grid.
+
+Planar movement is 4-connected, so the search uses the 4-connected variant of
+Jump Point Search: horizontal (x-axis) moves jump along a row until something
+interesting happens, vertical (y-axis) moves advance one tile at a time and
+spawn new horizontal jumps. Z-level transitions are ordinary A* edges.
+
+The search itself is a Numba kernel over the raw ``WorldGrid.flags`` array;
+tiles are identified by packed int64 keys (see ``_pack``) rather than tuples,
+and only the final path is turned back into ``Position`` objects.
+"""
 
 from __future__ import annotations
 
 import asyncio
-import heapq
-from typing import TYPE_CHECKING
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+from backend.world.grid import Position, WorldGrid, warm_up_neighbor_kernels, z_neighbors
+from backend.world.tile import TileFlag
+
+# Direction a node was entered from, used to prune its successors
+_EAST = 1
+_WEST = 2
+_SOUTH = 4
+_NORTH = 8
+_ANY = 16  # start node or arrival via z-transition: no pruning
+
+_WALKABLE = int(TileFlag.WALKABLE)
+_Z_EXIT_MASK = int(TileFlag.HAS_STAIR_UP | TileFlag.HAS_STAIR_DOWN | TileFlag.HAS_RAMP)
+
+# At most two jumps, two vertical steps and two z-transitions per node
+_MAX_SUCCESSORS = 6
+
+# Dedicated, bounded pool for searches. _search releases the GIL, so the
+# workers run in parallel without contending with the event loop.
+_PATHFIND_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="astar",
+)
+# Searches between tiles at most this Manhattan distance apart run inline on
+# the event loop: the compiled kernel finishes them faster than a thread hop.
+# Until _search is compiled, every search goes to the pool (see warm_up_kernels)
+INLINE_SEARCH_DISTANCE = 16
+
+
+@njit(cache=True)
+def _pack(x: int, y: int, z: int, width: int, height: int) -> int:
+    """Pack a tile coordinate into a single int64 dict key."""
+    return (z * height + y) * width + x
+
+
+@njit(cache=True)
+def _unpack(key: int, width: int, height: int) -> tuple[int, int, int]:
+    plane = width * height
+    return key % width, (key // width) % height, key // plane
+
+
+@njit(cache=True, inline="always")
+def _heuristic(x: int, y: int, z: int, gx: int, gy: int, gz: int) -> int:
+    """3D Manhattan distance: consistent for unit planar and cost-2 z moves."""
+    return abs(x - gx) + abs(y - gy) + abs(z - gz)
+
+
+@njit(cache=True)
+def _jump(
+    flags: np.ndarray,
+    x: int,
+    y: int,
+    z: int,
+    dx: int,
+    gx: int,
+    gy: int,
+    gz: int,
+) -> int:
+    """Walk along the row in direction dx until reaching a jump point.
+
+    A tile is a jump point if it is the goal, can change z-level, or has a
+    forced vertical neighbor: an open tile above/below whose counterpart one
+    step back is blocked, so no vertical-first path could have reached it.
+    Returns the jump point's x, or -1 if the walk hits a wall or the map edge.
+    """
+    height = flags.shape[1]
+    width = flags.shape[2]
+    while True:
+        x += dx
+        if x < 0 or x >= width:
+            return -1
+        f = flags[z, y, x]
+        if not f & _WALKABLE:
+            return -1
+        if f & _Z_EXIT_MASK or (x == gx and y == gy and z == gz):
+            return x
+        # The tile one step back is always in bounds: we just came from it
+        back = x - dx
+        if y + 1 < height and flags[z, y + 1, x] & _WALKABLE and not flags[z, y + 1, back] & _WALKABLE:
+            return x
+        if y > 0 and flags[z, y - 1, x] & _WALKABLE and not flags[z, y - 1, back] & _WALKABLE:
+            return x
+
+
+@njit(cache=True)
+def _successors(
+    flags: np.ndarray,
+    x: int,
+    y: int,
+    z: int,
+    arrival: int,
+    gx: int,
+    gy: int,
+    gz: int,
+    out: np.ndarray,
+) -> int:
+    """Write pruned successors into out as rows of (x, y, z, move_cost, direction).
+
+    Returns the number of rows written.
+    """
+    height = flags.shape[1]
+    width = flags.shape[2]
+    jump_east = jump_west = (arrival & (_ANY | _SOUTH | _NORTH)) != 0
+    step_south = (arrival & (_ANY | _SOUTH)) != 0
+    step_north = (arrival & (_ANY | _NORTH)) != 0
+    open_south = y + 1 < height and (flags[z, y + 1, x] & _WALKABLE) != 0
+    open_north = y > 0 and (flags[z, y - 1, x] & _WALKABLE) != 0
+
+    # Forced vertical neighbors of a horizontal arrival
+    if arrival & _EAST:
+        jump_east = True
+        if open_south and (x == 0 or not flags[z, y + 1, x - 1] & _WALKABLE):
+            step_south = True
+        if open_north and (x == 0 or not flags[z, y - 1, x - 1] & _WALKABLE):
+            step_north = True
+    if arrival & _WEST:
+        jump_west = True
+        if open_south and (x == width - 1 or not flags[z, y + 1, x + 1] & _WALKABLE):
+            step_south = True
+        if open_north and (x == width - 1 or not flags[z, y - 1, x + 1] & _WALKABLE):
+            step_north = True
+
+    n = 0
+    if jump_east:
+        jx = _jump(flags, x, y, z, 1, gx, gy, gz)
+        if jx >= 0:
+            out[n, 0], out[n, 1], out[n, 2], out[n, 3], out[n, 4] = jx, y, z, jx - x, _EAST
+            n += 1
+    if jump_west:
+        jx = _jump(flags, x, y, z, -1, gx, gy, gz)
+        if jx >= 0:
+            out[n, 0], out[n, 1], out[n, 2], out[n, 3], out[n, 4] = jx, y, z, x - jx, _WEST
+            n += 1
+    if step_south and open_south:
+        out[n, 0], out[n, 1], out[n, 2], out[n, 3], out[n, 4] = x, y + 1, z, 1, _SOUTH
+        n += 1
+    if step_north and open_north:
+        out[n, 0], out[n, 1], out[n, 2], out[n, 3], out[n, 4] = x, y - 1, z, 1, _NORTH
+        n += 1
+
+    # Z-level transitions are regular edges with cost 2
+    if flags[z, y, x] & _Z_EXIT_MASK:
+        first = n
+        n = z_neighbors(flags, x, y, z, out, n)
+        for i in range(first, n):
+            out[i, 3], out[i, 4] = 2, _ANY
+    return n
+
+
+@njit(cache=True, nogil=True)
+def _search(
+    flags: np.ndarray,
+    sx: int,
+    sy: int,
+    sz: int,
+    gx: int,
+    gy: int,
+    gz: int,
+    max_iterations: int,
+) -> np.ndarray:
+    """Jump point search kernel. Returns the jump points as an (N, 3) array.
+
+    An empty array means no path was found within max_iterations expansions.
+    """
+    height = flags.shape[1]
+    width = flags.shape[2]
+
+    # Bucket queue keyed by integer f-score. Edge costs are small integers and
+    # the Manhattan heuristic is consistent, so f never decreases along an
+    # expansion and a rolling min_f cursor replaces heap operations. Each bucket
+    # is a singly linked stack threaded through the entry arrays.
+    min_f = _heuristic(sx, sy, sz, gx, gy, gz)
+    heads = np.full(max(64, 2 * min_f + 1), -1, np.int64)
+    entry_key = np.empty(1024, np.int64)
+    entry_next = np.empty(1024, np.int64)
+
+    start_key = _pack(sx, sy, sz, width, height)
+    goal_key = _pack(gx, gy, gz, width, height)
+    entry_key[0] = start_key
+    entry_next[0] = -1
+    heads[min_f] = 0
+    n_entries = 1
+
+    came_from = Dict.empty(key_type=types.int64, value_type=types.int64)
+    g_score = Dict.empty(key_type=types.int64, value_type=types.int64)
+    # Arrival directions seen at the best g, and those already expanded.
+    # A node reached from a new direction at equal cost is re-expanded for
+    # just the successors that direction unlocks.
+    arrivals = Dict.empty(key_type=types.int64, value_type=types.int64)
+    expanded = Dict.empty(key_type=types.int64, value_type=types.int64)
+    g_score[start_key] = 0
+    arrivals[start_key] = _ANY
 
-from backend.world.grid import Position
+    succ = np.empty((_MAX_SUCCESSORS, 5), np.int64)
+    iterations = 0
+    while iterations < max_iterations:
+        while min_f < len(heads) and heads[min_f] == -1:
+            min_f += 1
+        if min_f == len(heads):
+            break
+
+        entry = heads[min_f]
+        heads[min_f] = entry_next[entry]
+        current_key = entry_key[entry]
+
+        # Lazy deletion: skip entries with no unexpanded arrival directions
+        done = expanded.get(current_key, 0)
+        pending = arrivals[current_key] & ~done
+        if pending == 0:
+            continue
+        expanded[current_key] = done | pending
+        iterations += 1
+
+        if current_key == goal_key:
+            count = 1
+            key = current_key
+            while key != start_key:
+                key = came_from[key]
+                count += 1
+            result = np.empty((count, 3), np.int32)
+            key = current_key
+            for i in range(count - 1, -1, -1):
+                result[i, 0], result[i, 1], result[i, 2] = _unpack(key, width, height)
+                if i > 0:
+                    key = came_from[key]
+            return result
+
+        cx, cy, cz = _unpack(current_key, width, height)
+        current_g = g_score[current_key]
+        n_succ = _successors(flags, cx, cy, cz, pending, gx, gy, gz, succ)
+        for i in range(n_succ):
+            nx, ny, nz = succ[i, 0], succ[i, 1], succ[i, 2]
+            direction = succ[i, 4]
+            n_key = _pack(nx, ny, nz, width, height)
+            tentative_g = current_g + succ[i, 3]
+            old_g = g_score.get(n_key, -1)
+
+            if old_g == -1 or tentative_g < old_g:
+                g_score[n_key] = tentative_g
+                came_from[n_key] = current_key
+                arrivals[n_key] = direction
+                expanded[n_key] = 0
+            elif tentative_g == old_g and not arrivals[n_key] & direction:
+                arrivals[n_key] |= direction
+            else:
+                continue
+
+            f_score = tentative_g + _heuristic(nx, ny, nz, gx, gy, gz)
+            if f_score >= len(heads):
+                grown = np.full(max(2 * len(heads), f_score + 1), -1, np.int64)
+                grown[: len(heads)] = heads
+                heads = grown
+            if n_entries == len(entry_key):
+                entry_key = np.concatenate((entry_key, np.empty(len(entry_key), np.int64)))
+                entry_next = np.concatenate((entry_next, np.empty(len(entry_next), np.int64)))
+            entry_key[n_entries] = n_key
+            entry_next[n_entries] = heads[f_score]
+            heads[f_score] = n_entries
+            n_entries += 1
+
+    return np.empty((0, 3), np.int32)  # No path found
 
-if TYPE_CHECKING:
-    from backend.world.grid import WorldGrid
+
+def _expand_path(jump_points: list[list[int]]) -> list[Position]:
+    """Fill in the straight runs between consecutive jump points."""
+    path = [Position(*jump_points[0])]
+    for (ax, ay, az), (bx, by, bz) in zip(jump_points, jump_points[1:]):
+        if az == bz and ay == by:
+            step = 1 if bx > ax else -1
+            for x in range(ax + step, bx + step, step):
+                path.append(Position(x, by, bz))
+        else:
+            path.append(Position(bx, by, bz))
+    return path
 
 
 def _find_path_sync(
@@ -18,58 +301,46 @@ def _find_path_sync(
     world: WorldGrid,
     max_iterations: int = 10000,
 ) -> list[Position] | None:
-    """A* pathfinding on the 3D grid. Returns path as list of positions, or None."""
+    """Jump point search on the 3D grid. Returns path as list of positions, or None.
+
+    max_iterations bounds the number of jump points expanded.
+    """
     if start == goal:
         return [start]
 
-    if not world.is_walkable(goal.x, goal.y, goal.z):
+    if not world.in_bounds(start.x, start.y, start.z):
         return None
 
-    # Priority queue: (f_score, counter, position)
-    counter = 0
-    open_set: list[tuple[int, int, tuple[int, int, int]]] = []
-    start_key = start.to_tuple()
-    goal_key = goal.to_tuple()
-    heapq.heappush(open_set, (0, counter, start_key))
-
-    came_from: dict[tuple[int, int, int], tuple[int, int, int]] = {}
-    g_score: dict[tuple[int, int, int], int] = {start_key: 0}
+    if not world.is_walkable(goal.x, goal.y, goal.z):
+        return None
 
-    iterations = 0
-    while open_set and iterations < max_iterations:
-        iterations += 1
-        _, _, current_key = heapq.heappop(open_set)
+    jump_points = _search(
+        world.flags,
+        start.x, start.y, start.z,
+        goal.x, goal.y, goal.z,
+        max_iterations,
+    )
+    if len(jump_points) == 0:
+        return None  # No path found
+    return _expand_path(jump_points.tolist())
 
-        if current_key == goal_key:
-            # Reconstruct path
-            path = []
-            key = current_key
-            while key in came_from:
-                path.append(Position(key[0], key[1], key[2]))
-                key = came_from[key]
-            path.append(start)
-            path.reverse()
-            return path
 
-        cx, cy, cz = current_key
-        neighbors = world.get_neighbors_3d(cx, cy, cz)
+def _search_compiled() -> bool:
+    """Whether _search is compiled, so calling it cannot stall on Numba."""
+    return bool(_search.signatures)
 
-        for neighbor in neighbors:
-            n_key = neighbor.to_tuple()
-            # Movement cost: 1 for horizontal, 2 for z-level change
-            move_cost = 1 if neighbor.z == cz else 2
-            tentative_g = g_score[current_key] + move_cost
 
-            if n_key not in g_score or tentative_g < g_score[n_key]:
-                g_score[n_key] = tentative_g
-                # Heuristic: 3D Manhattan distance
-                h = abs(neighbor.x - goal.x) + abs(neighbor.y - goal.y) + abs(neighbor.z - goal.z)
-                f_score = tentative_g + h
-                counter += 1
-                heapq.heappush(open_set, (f_score, counter, n_key))
-                came_from[n_key] = current_key
+def warm_up_kernels() -> None:
+    """Compile, or load from Numba's on-disk cache, every kernel a search uses.
 
-    return None  # No path found
+    Also warms the grid's neighbor kernels. Blocking: main.lifespan runs it
+    in a worker thread so compile cost never lands on a tick or request.
+    """
+    warm_up_neighbor_kernels()
+    grid = WorldGrid(width=2, height=2, depth=1)
+    grid.flags[0] = TileFlag.WALKABLE.value
+    grid.invalidate_walk_mask()
+    _find_path_sync(Position(0, 0, 0), Position(1, 1, 0), grid)
 
 
 async def find_path(
@@ -78,7 +349,9 @@ async def find_path(
     world: WorldGrid,
     max_iterations: int = 10000,
 ) -> list[Position] | None:
-    """Async wrapper that runs A* in a thread pool to avoid blocking."""
-    return await asyncio.to_thread(
-        _find_path_sync, start, goal, world, max_iterations
+    """Async wrapper that runs long searches on the pathfinding pool to avoid blocking."""
+    if _search_compiled() and start.manhattan_distance(goal) <= INLINE_SEARCH_DISTANCE:
+        return _find_path_sync(start, goal, world, max_iterations)
+    return await asyncio.get_running_loop().run_in_executor(
+        _PATHFIND_POOL, _find_path_sync, start, goal, world, max_iterations
     )
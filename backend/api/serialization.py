@@ -1,42 +1,73 @@
-"""Serialization of world state for WebSocket transmission."""
+"""Serialization of world state for WebSocket transmission.
+
+Metadata, creatures and items go out as JSON text frames. Tile data goes out
+as binary frames: a fixed little-endian header whose first byte is a
+``BinaryMessageType``, followed by raw array buffers.
+"""
 
 from __future__ import annotations
 
+import struct
+from enum import IntEnum
 from typing import Any
 
+import numpy as np
+
 from backend.config import MAP_DEPTH, MAP_HEIGHT, MAP_WIDTH, SURFACE_Z
 from backend.world.grid import WorldGrid
 from backend.world.tile import TileFlag, TileType
 
 
-def serialize_tile(world: WorldGrid, x: int, y: int, z: int) -> dict[str, Any]:
-    """Serialize a single tile to a JSON-compatible dict."""
-    return {
-        "x": x,
-        "y": y,
-        "z": z,
-        "wall": int(world.get_wall_type(x, y, z)),
-        "floor": int(world.get_floor_type(x, y, z)),
-        "flags": int(world.get_flags(x, y, z)),
-    }
+class BinaryMessageType(IntEnum):
+    """First byte of every binary frame."""
+    Z_LEVEL = 1
+    TILE_DELTA = 2
+
 
+# type, pad, z, width, height: 8 bytes keeps the uint16 flags buffer aligned
+Z_LEVEL_HEADER = struct.Struct("<BxHHH")
+# type, pad, tile count
+TILE_DELTA_HEADER = struct.Struct("<BxxxI")
 
-def serialize_z_level(world: WorldGrid, z: int) -> list[list[dict[str, int]]]:
-    """Serialize an entire z-level as a 2D array of tile data.
 
-    Returns a 2D list [y][x] of compact tile dicts {w, f, fl}.
+def serialize_z_level_binary(world: WorldGrid, z: int) -> bytes:
+    """Serialize an entire z-level as one binary frame.
+
+    Layout after the header: wall types (uint8), floor types (uint8) and
+    flags (uint16), each a row-major [y][x] buffer of width * height values.
+    """
+    header = Z_LEVEL_HEADER.pack(BinaryMessageType.Z_LEVEL, z, world.width, world.height)
+    return b"".join((
+        header,
+        world.wall_types[z].tobytes(),
+        world.floor_types[z].tobytes(),
+        world.flags[z].astype("<u2", copy=False).tobytes(),
+    ))
+
+
+def serialize_tile_delta_binary(world: WorldGrid, changed_tiles: np.ndarray) -> bytes | None:
+    """Serialize changed tiles as one binary frame of parallel arrays.
+
+    changed_tiles holds flat [z, y, x] indices, as from GameState.pop_changed_tiles.
+    Layout after the header, N values each: x, y, z and flags (uint16), then
+    wall and floor types (uint8). The uint16 arrays come first so that every
+    array starts at an offset its element size divides.
     """
-    level = []
-    for y in range(world.height):
-        row = []
-        for x in range(world.width):
-            row.append({
-                "w": int(world.wall_types[z, y, x]),
-                "f": int(world.floor_types[z, y, x]),
-                "fl": int(world.flags[z, y, x]),
-            })
-        level.append(row)
-    return level
+    if len(changed_tiles) == 0:
+        return None
+
+    zs, rem = np.divmod(changed_tiles, world.height * world.width)
+    ys, xs = np.divmod(rem, world.width)
+    header = TILE_DELTA_HEADER.pack(BinaryMessageType.TILE_DELTA, len(changed_tiles))
+    return b"".join((
+        header,
+        xs.astype("<u2").tobytes(),
+        ys.astype("<u2").tobytes(),
+        zs.astype("<u2").tobytes(),
+        world.flags.ravel()[changed_tiles].astype("<u2", copy=False).tobytes(),
+        world.wall_types.ravel()[changed_tiles].tobytes(),
+        world.floor_types.ravel()[changed_tiles].tobytes(),
+    ))
 
 
 def serialize_world_snapshot(
@@ -55,33 +86,19 @@ def serialize_world_snapshot(
     }
 
 
-def serialize_z_level_snapshot(world: WorldGrid, z: int) -> dict[str, Any]:
-    """Serialize a single z-level snapshot (sent on z-level change)."""
-    return {
-        "type": "z_level",
-        "z": z,
-        "tiles": serialize_z_level(world, z),
-    }
-
-
 def serialize_delta(
-    world: WorldGrid,
-    changed_tiles: set[tuple[int, int, int]],
     creatures: list[dict[str, Any]] | None = None,
     items: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any] | None:
-    """Serialize only changed data since last tick."""
-    if not changed_tiles and not creatures and not items:
+    """Serialize changed creatures/items since last tick.
+
+    Tile changes are sent separately via serialize_tile_delta_binary.
+    """
+    if not creatures and not items:
         return None
 
     delta: dict[str, Any] = {"type": "delta"}
 
-    if changed_tiles:
-        delta["tiles"] = [
-            serialize_tile(world, x, y, z)
-            for x, y, z in changed_tiles
-        ]
-
     if creatures:
         delta["creatures"] = creatures
 
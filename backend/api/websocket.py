@@ -3,21 +3,37 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from collections import OrderedDict
 from typing import Any
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 from backend.api.serialization import (
-    serialize_delta,
     serialize_world_snapshot,
-    serialize_z_level_snapshot,
+    serialize_z_level_binary,
 )
 from backend.simulation.game_state import GameState
 
 logger = logging.getLogger(__name__)
 
+# Number of serialized z-level frames kept for reuse across clients
+Z_LEVEL_CACHE_SIZE = 8
+
+
+def _encode_json(message: dict[str, Any]) -> str:
+    """Encode a message for a JSON text frame.
+
+    Text frames stay reserved for JSON so binary frames can be dispatched on
+    their BinaryMessageType byte alone.
+    """
+    return orjson.dumps(message).decode()
+
+
+async def _send_json(websocket: WebSocket, message: dict[str, Any]) -> None:
+    await websocket.send_text(_encode_json(message))
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts state updates."""
@@ -25,9 +41,26 @@ class ConnectionManager:
     def __init__(self) -> None:
         self.active_connections: list[WebSocket] = []
         self._game_state: GameState | None = None
+        # (z, z-level version) -> serialized frame, least recently used first
+        self._z_level_cache: OrderedDict[tuple[int, int], bytes] = OrderedDict()
 
     def set_game_state(self, game_state: GameState) -> None:
         self._game_state = game_state
+        self._z_level_cache.clear()
+
+    def _z_level_frame(self, game_state: GameState, z: int) -> bytes:
+        """Return the binary frame for a z-level, reusing a cached copy if unchanged."""
+        key = (z, game_state.z_level_version(z))
+        frame = self._z_level_cache.get(key)
+        if frame is not None:
+            self._z_level_cache.move_to_end(key)
+            return frame
+
+        frame = serialize_z_level_binary(game_state.world, z)
+        self._z_level_cache[key] = frame
+        if len(self._z_level_cache) > Z_LEVEL_CACHE_SIZE:
+            self._z_level_cache.popitem(last=False)
+        return frame
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
@@ -38,27 +71,36 @@ class ConnectionManager:
             # Send world metadata snapshot with creature data
             creatures = self._game_state.creature_system.serialize_all()
             snapshot = serialize_world_snapshot(self._game_state.world, creatures)
-            await websocket.send_json(snapshot)
+            await _send_json(websocket, snapshot)
 
             # Send the surface z-level tiles
             from backend.config import SURFACE_Z
-            z_data = serialize_z_level_snapshot(self._game_state.world, SURFACE_Z)
-            await websocket.send_json(z_data)
+            await websocket.send_bytes(self._z_level_frame(self._game_state, SURFACE_Z))
 
     def disconnect(self, websocket: WebSocket) -> None:
         self.active_connections.remove(websocket)
         logger.info("Client disconnected (%d remaining)", len(self.active_connections))
 
     async def broadcast(self, message: dict[str, Any]) -> None:
-        """Send a message to all connected clients."""
+        """Send a JSON message to all connected clients."""
+        if not self.active_connections:
+            return
+        await self._broadcast_frame(_encode_json(message))
+
+    async def broadcast_bytes(self, data: bytes) -> None:
+        """Send a binary frame to all connected clients."""
         if not self.active_connections:
             return
+        await self._broadcast_frame(data)
 
-        data = json.dumps(message)
+    async def _broadcast_frame(self, data: str | bytes) -> None:
         disconnected = []
         for connection in self.active_connections:
             try:
-                await connection.send_text(data)
+                if isinstance(data, bytes):
+                    await connection.send_bytes(data)
+                else:
+                    await connection.send_text(data)
             except Exception:
                 disconnected.append(connection)
 
@@ -81,8 +123,7 @@ class ConnectionManager:
         if msg_type == "request_z_level":
             z = data.get("z", 0)
             if self._game_state:
-                z_data = serialize_z_level_snapshot(self._game_state.world, z)
-                await websocket.send_json(z_data)
+                await websocket.send_bytes(self._z_level_frame(self._game_state, z))
 
         elif msg_type == "designate":
             # Will be handled in Phase 3
@@ -93,7 +134,7 @@ class ConnectionManager:
                 from backend.main import game_loop
                 if game_loop:
                     game_loop.paused = not game_loop.paused
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "pause_state",
                         "paused": game_loop.paused,
                     })
@@ -6,3 +6,4 @@ MAP_DEPTH = 64
 SURFACE_Z = 40
 TICK_RATE = 20  # ticks per second
 TICK_INTERVAL = 1.0 / TICK_RATE
+BROADCAST_INTERVAL = TICK_INTERVAL * 2  # clients get state at 10 Hz
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import uuid
+import itertools
 from enum import Enum
 from typing import Any
 
+import numpy as np
+
 from backend.world.grid import Position
 
 
@@ -34,6 +36,13 @@ class LaborType(str, Enum):
     DOCTORING = "doctoring"
 
 
+# Source of creature ids, unique for the lifetime of the process
+_next_creature_id = itertools.count(1).__next__
+
+# Width of the need bands used to decide when a creature needs re-sending;
+# smaller drifts in hunger/thirst/energy are not broadcast
+NEED_REPORT_BAND = 5.0
+
 # Display chars and colors per creature type
 CREATURE_DISPLAY = {
     CreatureType.DWARF: ("@", "#fff"),
@@ -43,19 +52,121 @@ CREATURE_DISPLAY = {
 }
 
 
+class CreatureNeeds:
+    """Struct-of-arrays storage for creature needs, indexed by slot.
+
+    Lets needs decay for every creature in a few vectorized operations
+    instead of a Python method call per creature.
+    """
+
+    # Per-slot float arrays, for code that copies or grows every field
+    FLOAT_FIELDS = (
+        "hunger", "thirst", "energy",
+        "hunger_decay", "thirst_decay", "energy_decay",
+    )
+
+    def __init__(self, capacity: int = 16) -> None:
+        self.hunger = np.zeros(capacity, dtype=np.float64)
+        self.thirst = np.zeros(capacity, dtype=np.float64)
+        self.energy = np.zeros(capacity, dtype=np.float64)
+        # Per-tick decay of each need
+        self.hunger_decay = np.zeros(capacity, dtype=np.float64)
+        self.thirst_decay = np.zeros(capacity, dtype=np.float64)
+        self.energy_decay = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Need bands and alive flag per slot as last reported by pop_changed;
+        # -1 forces a report
+        self.reported = np.full(capacity, -1, dtype=np.int64)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def allocate(self) -> int:
+        """Reserve a slot, growing the arrays if full."""
+        if not self._free:
+            old = self.capacity
+            for name in (*self.FLOAT_FIELDS, "alive", "reported"):
+                array = getattr(self, name)
+                grown = np.zeros(old * 2, dtype=array.dtype)
+                grown[:old] = array
+                setattr(self, name, grown)
+            self._free = list(range(old * 2 - 1, old - 1, -1))
+        slot = self._free.pop()
+        self.reported[slot] = -1
+        return slot
+
+    def release(self, slot: int) -> None:
+        self.alive[slot] = False
+        self._free.append(slot)
+
+    def tick(self, index: int | None = None) -> None:
+        """Decay needs for all slots, or just one; kills starved/dehydrated."""
+        sel = slice(None) if index is None else slice(index, index + 1)
+        alive = self.alive[sel]
+        for need, decay in (
+            (self.hunger, self.hunger_decay),
+            (self.thirst, self.thirst_decay),
+            (self.energy, self.energy_decay),
+        ):
+            values = need[sel]
+            np.subtract(values, decay[sel], out=values, where=alive)
+            np.maximum(values, 0.0, out=values)
+
+        # Death from starvation/dehydration
+        alive &= (self.hunger[sel] > 0.0) & (self.thirst[sel] > 0.0)
+
+    def pop_changed(self) -> np.ndarray:
+        """Return a bool mask of slots whose alive flag or any need's
+        NEED_REPORT_BAND band changed since the last call."""
+        code = self.alive.astype(np.int64)
+        for need in (self.hunger, self.thirst, self.energy):
+            code = code * 32 + (need // NEED_REPORT_BAND).astype(np.int64)
+        changed = code != self.reported
+        self.reported = code
+        return changed
+
+
+def _needs_field(name: str) -> property:
+    """Creature attribute backed by its slot in a CreatureNeeds store."""
+    def fget(self: Creature) -> float:
+        return float(getattr(self._needs, name)[self._slot])
+
+    def fset(self: Creature, value: float) -> None:
+        getattr(self._needs, name)[self._slot] = value
+
+    return property(fget, fset)
+
+
 class Creature:
     """Base class for all creatures in the game."""
 
+    hunger = _needs_field("hunger")
+    thirst = _needs_field("thirst")
+    energy = _needs_field("energy")
+    hunger_decay = _needs_field("hunger_decay")
+    thirst_decay = _needs_field("thirst_decay")
+    energy_decay = _needs_field("energy_decay")
+
     def __init__(
         self,
         name: str,
         creature_type: CreatureType,
         position: Position,
     ) -> None:
-        self.id = str(uuid.uuid4())
+        self.id = _next_creature_id()
         self.name = name
         self.creature_type = creature_type
+        # Set whenever a serialized field outside the needs store changes;
+        # cleared once the creature has been sent in a delta
+        self.serial_dirty = True
         self.position = position
+
+        # Needs live in a CreatureNeeds store; a standalone creature owns a
+        # one-slot store until a CreatureSystem adopts it
+        self._needs = CreatureNeeds(capacity=1)
+        self._slot = self._needs.allocate()
         self.alive = True
 
         # Needs (0 = empty/critical, 100 = full/satisfied)
@@ -74,8 +185,12 @@ class Creature:
         self.path_index = 0
         self.move_cooldown = 0  # ticks until next move
 
+        # Tick offset for AI decisions, so creatures don't all decide on the
+        # same tick
+        self.ai_phase = hash(self.id) & 0x3F
+
         # Job
-        self.current_job_id: str | None = None
+        self.current_job_id = None
 
         # Skills: SkillType -> Skill (added in Phase 3)
         self.skills: dict[str, Any] = {}
@@ -83,18 +198,49 @@ class Creature:
         # Labors this creature can perform
         self.enabled_labors: set[LaborType] = set()
 
+    @property
+    def position(self) -> Position:
+        return self._position
+
+    @position.setter
+    def position(self, value: Position) -> None:
+        self._position = value
+        self.serial_dirty = True
+
+    @property
+    def current_job_id(self) -> str | None:
+        return self._current_job_id
+
+    @current_job_id.setter
+    def current_job_id(self, value: str | None) -> None:
+        self._current_job_id = value
+        self.serial_dirty = True
+
+    @property
+    def needs_slot(self) -> int:
+        """Index of this creature in its CreatureNeeds store."""
+        return self._slot
+
+    @property
+    def alive(self) -> bool:
+        return bool(self._needs.alive[self._slot])
+
+    @alive.setter
+    def alive(self, value: bool) -> None:
+        self._needs.alive[self._slot] = value
+
+    def bind_needs(self, store: CreatureNeeds) -> None:
+        """Move this creature's needs into a slot of another store."""
+        slot = store.allocate()
+        for name in (*CreatureNeeds.FLOAT_FIELDS, "alive"):
+            getattr(store, name)[slot] = getattr(self._needs, name)[self._slot]
+        self._needs.release(self._slot)
+        self._needs = store
+        self._slot = slot
+
     def tick_needs(self) -> None:
         """Decay needs each tick."""
-        if not self.alive:
-            return
-
-        self.hunger = max(0.0, self.hunger - self.hunger_decay)
-        self.thirst = max(0.0, self.thirst - self.thirst_decay)
-        self.energy = max(0.0, self.energy - self.energy_decay)
-
-        # Death from starvation/dehydration
-        if self.hunger <= 0.0 or self.thirst <= 0.0:
-            self.alive = False
+        self._needs.tick(self._slot)
 
     def needs_food(self) -> bool:
         return self.hunger < 30.0
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -9,6 +10,7 @@ from pathlib import Path
 from fastapi import FastAPI, WebSocket
 from fastapi.staticfiles import StaticFiles
 
+from backend.ai.pathfinding import warm_up_kernels
 from backend.api.routes import router
 from backend.api.websocket import manager
 from backend.config import SURFACE_Z
@@ -52,6 +54,9 @@ def _spawn_starting_dwarves(state: GameState) -> None:
 async def lifespan(app: FastAPI):
     global game_state, game_loop
 
+    # Compile the Numba kernels before the first tick can need them
+    await asyncio.to_thread(warm_up_kernels)
+
     logger.info("Generating world...")
     world = generate_world(seed=42)
     logger.info("World generated")
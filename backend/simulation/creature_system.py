@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from functools import partial
 from typing import TYPE_CHECKING
 
 from backend.ai.decision import decide_action
-from backend.entities.creature import Creature
+from backend.config import MAP_HEIGHT, MAP_WIDTH
+from backend.entities.creature import Creature, CreatureNeeds
 from backend.world.grid import Position
 
 if TYPE_CHECKING:
@@ -23,37 +26,59 @@ MOVE_INTERVAL = 3
 class CreatureSystem:
     """Manages all creatures: stores them, ticks needs/AI/movement."""
 
-    def __init__(self) -> None:
-        self.creatures: dict[str, Creature] = {}
-        # Spatial index: position tuple -> set of creature IDs
-        self._spatial: dict[tuple[int, int, int], set[str]] = {}
+    def __init__(self, width: int = MAP_WIDTH, height: int = MAP_HEIGHT) -> None:
+        self.width = width
+        self.height = height
+        self.creatures: dict[int, Creature] = {}
+        # Needs of every managed creature, decayed in bulk each tick
+        self.needs = CreatureNeeds()
+        # Spatial index: packed (z * H + y) * W + x -> creature IDs. Cells
+        # rarely hold more than one creature, so a list beats a set
+        self._spatial: dict[int, list[int]] = {}
+        # tick() iterates self.creatures directly and awaits AI decisions, so
+        # additions/removals made meanwhile are replayed, in call order, once
+        # the loop ends
+        self._ticking = False
+        self._deferred: list[Callable[[], object]] = []
+        # Creatures removed since the last serialize_changed call
+        self._removed_ids: list[int] = []
 
     def add_creature(self, creature: Creature) -> None:
+        if self._ticking:
+            self._deferred.append(partial(self.add_creature, creature))
+            return
         self.creatures[creature.id] = creature
+        creature.bind_needs(self.needs)
         self._add_to_spatial(creature)
 
-    def remove_creature(self, creature_id: str) -> Creature | None:
+    def remove_creature(self, creature_id: int) -> Creature | None:
+        if self._ticking:
+            self._deferred.append(partial(self.remove_creature, creature_id))
+            return self.creatures.get(creature_id)
         creature = self.creatures.pop(creature_id, None)
         if creature:
             self._remove_from_spatial(creature)
+            self._removed_ids.append(creature_id)
+            creature.bind_needs(CreatureNeeds(capacity=1))
         return creature
 
     def get_at_position(self, pos: Position) -> list[Creature]:
-        key = pos.to_tuple()
-        ids = self._spatial.get(key, set())
+        ids = self._spatial.get(self._spatial_key(pos), ())
         return [self.creatures[cid] for cid in ids if cid in self.creatures]
 
+    def _spatial_key(self, pos: Position) -> int:
+        return (pos.z * self.height + pos.y) * self.width + pos.x
+
     def _add_to_spatial(self, creature: Creature) -> None:
-        key = creature.position.to_tuple()
-        if key not in self._spatial:
-            self._spatial[key] = set()
-        self._spatial[key].add(creature.id)
+        key = self._spatial_key(creature.position)
+        self._spatial.setdefault(key, []).append(creature.id)
 
     def _remove_from_spatial(self, creature: Creature) -> None:
-        key = creature.position.to_tuple()
-        if key in self._spatial:
-            self._spatial[key].discard(creature.id)
-            if not self._spatial[key]:
+        key = self._spatial_key(creature.position)
+        ids = self._spatial.get(key)
+        if ids and creature.id in ids:
+            ids.remove(creature.id)
+            if not ids:
                 del self._spatial[key]
 
     def _move_creature(self, creature: Creature, new_pos: Position) -> None:
@@ -62,35 +87,63 @@ class CreatureSystem:
         self._add_to_spatial(creature)
 
     async def tick(self, game_state: GameState, tick_number: int) -> None:
-        for creature in list(self.creatures.values()):
-            if not creature.alive:
-                continue
-
-            # 1. Decay needs every tick
-            creature.tick_needs()
-            if not creature.alive:
-                continue
-
-            # 2. Move along current path
-            if creature.current_path and creature.path_index < len(creature.current_path):
-                if creature.move_cooldown <= 0:
-                    next_pos = creature.current_path[creature.path_index]
-                    if game_state.world.is_walkable(next_pos.x, next_pos.y, next_pos.z):
-                        self._move_creature(creature, next_pos)
-                    creature.path_index += 1
-                    creature.move_cooldown = MOVE_INTERVAL
-
-                    # Clear path if we've reached the end
-                    if creature.path_index >= len(creature.current_path):
-                        creature.current_path = []
-                        creature.path_index = 0
-                else:
-                    creature.move_cooldown -= 1
-                continue
-
-            # 3. AI decision (not every tick)
-            if tick_number % AI_DECISION_INTERVAL == 0:
-                await decide_action(creature, game_state)
+        # 1. Decay needs every tick, for all creatures at once
+        self.needs.tick()
+
+        self._ticking = True
+        try:
+            for creature in self.creatures.values():
+                await self._tick_creature(creature, game_state, tick_number)
+        finally:
+            self._ticking = False
+        self._apply_deferred()
+
+    def _apply_deferred(self) -> None:
+        deferred, self._deferred = self._deferred, []
+        for change in deferred:
+            change()
+
+    async def _tick_creature(
+        self, creature: Creature, game_state: GameState, tick_number: int
+    ) -> None:
+        if not creature.alive:
+            return
+
+        # 2. Move along current path
+        if creature.current_path and creature.path_index < len(creature.current_path):
+            if creature.move_cooldown <= 0:
+                next_pos = creature.current_path[creature.path_index]
+                if game_state.world.is_walkable(next_pos.x, next_pos.y, next_pos.z):
+                    self._move_creature(creature, next_pos)
+                creature.path_index += 1
+                creature.move_cooldown = MOVE_INTERVAL
+
+                # Clear path if we've reached the end
+                if creature.path_index >= len(creature.current_path):
+                    creature.current_path = []
+                    creature.path_index = 0
+            else:
+                creature.move_cooldown -= 1
+            return
+
+        # 3. AI decision (not every tick, staggered across creatures)
+        if tick_number % AI_DECISION_INTERVAL == creature.ai_phase % AI_DECISION_INTERVAL:
+            await decide_action(creature, game_state)
 
     def serialize_all(self) -> list[dict]:
         return [c.serialize() for c in self.creatures.values()]
+
+    def serialize_changed(self) -> list[dict]:
+        """Serialize creatures changed since the last call, plus removals.
+
+        A creature counts as changed when its position or job was set, or
+        when it died or a need crossed a NEED_REPORT_BAND boundary.
+        """
+        needs_changed = self.needs.pop_changed()
+        changed = [{"id": cid, "removed": True} for cid in self._removed_ids]
+        self._removed_ids.clear()
+        for creature in self.creatures.values():
+            if creature.serial_dirty or needs_changed[creature.needs_slot]:
+                creature.serial_dirty = False
+                changed.append(creature.serialize())
+        return changed
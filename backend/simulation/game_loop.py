@@ -7,7 +7,7 @@ import logging
 import time
 from typing import TYPE_CHECKING
 
-from backend.config import TICK_INTERVAL
+from backend.config import BROADCAST_INTERVAL, TICK_INTERVAL
 
 if TYPE_CHECKING:
     from backend.simulation.game_state import GameState
@@ -24,6 +24,7 @@ class GameLoop:
         self.tick_count = 0
         self.paused = False
         self._task: asyncio.Task | None = None
+        self._broadcast_accumulator = 0.0
 
     async def start(self) -> None:
         self.running = True
@@ -69,16 +70,27 @@ class GameLoop:
         self.tick_count += 1
         await self.game_state.tick(self.tick_count)
 
-        # Broadcast state deltas to connected clients
-        from backend.api.serialization import serialize_delta
+        # Broadcast at BROADCAST_INTERVAL rather than every tick. Changed
+        # tiles keep accumulating in GameState until the next broadcast, and
+        # creatures are sent as their current state, so skipped ticks lose
+        # nothing.
+        self._broadcast_accumulator += TICK_INTERVAL
+        if self._broadcast_accumulator < BROADCAST_INTERVAL - 1e-9:
+            return
+        self._broadcast_accumulator -= BROADCAST_INTERVAL
+        await self._broadcast()
+
+    async def _broadcast(self) -> None:
+        """Send the state deltas accumulated since the last broadcast."""
+        from backend.api.serialization import serialize_delta, serialize_tile_delta_binary
         from backend.api.websocket import manager
 
-        creatures = self.game_state.creature_system.serialize_all()
         changed_tiles = self.game_state.pop_changed_tiles()
-        delta = serialize_delta(
-            self.game_state.world,
-            changed_tiles,
-            creatures=creatures,
-        )
+        tile_delta = serialize_tile_delta_binary(self.game_state.world, changed_tiles)
+        if tile_delta:
+            await manager.broadcast_bytes(tile_delta)
+
+        creatures = self.game_state.creature_system.serialize_changed()
+        delta = serialize_delta(creatures=creatures)
         if delta:
             await manager.broadcast(delta)
@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numpy as np
+
 from backend.simulation.creature_system import CreatureSystem
 from backend.world.grid import WorldGrid
 
@@ -16,19 +18,35 @@ class GameState:
 
     def __init__(self, world: WorldGrid) -> None:
         self.world = world
-        self.creature_system = CreatureSystem()
+        self.creature_system = CreatureSystem(world.width, world.height)
         self.systems: list[Any] = []
-        self._changed_tiles: set[tuple[int, int, int]] = set()
+        # One byte per tile, flat [z, y, x] order; nonzero = changed since last pop
+        self._dirty = np.zeros(world.depth * world.height * world.width, dtype=np.uint8)
+        self._any_dirty = False
+        # Bumped whenever a tile on that z-level changes; lets serialized
+        # z-level snapshots be cached until they go stale
+        self._z_level_versions: dict[int, int] = {}
 
     def register_system(self, system: Any) -> None:
         self.systems.append(system)
 
     def mark_tile_changed(self, x: int, y: int, z: int) -> None:
-        self._changed_tiles.add((x, y, z))
-
-    def pop_changed_tiles(self) -> set[tuple[int, int, int]]:
-        changed = self._changed_tiles
-        self._changed_tiles = set()
+        world = self.world
+        self._dirty[(z * world.height + y) * world.width + x] = 1
+        self._any_dirty = True
+        world.refresh_walkable(x, y, z)
+        self._z_level_versions[z] = self._z_level_versions.get(z, 0) + 1
+
+    def z_level_version(self, z: int) -> int:
+        return self._z_level_versions.get(z, 0)
+
+    def pop_changed_tiles(self) -> np.ndarray:
+        """Return flat [z, y, x] indices of tiles changed since the last call."""
+        if not self._any_dirty:
+            return np.empty(0, dtype=np.intp)
+        changed = np.flatnonzero(self._dirty)
+        self._dirty.fill(0)
+        self._any_dirty = False
         return changed
 
     async def tick(self, tick_number: int) -> None:
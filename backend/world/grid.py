@@ -2,37 +2,95 @@
 
 from __future__ import annotations
 
+from enum import IntEnum
+from typing import NamedTuple
+
 import numpy as np
+from numba import njit
 
 from backend.config import MAP_DEPTH, MAP_HEIGHT, MAP_WIDTH
 from backend.world.tile import TileFlag, TileType
 
 
-class Position:
-    """3D position in the world."""
-    __slots__ = ("x", "y", "z")
+# Planar movement is 4-connected
+_CARDINAL_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _members_by_value(enum: type[IntEnum]) -> tuple[IntEnum | None, ...]:
+    """Members of enum indexed by value; unused values in between map to None."""
+    table: list[IntEnum | None] = [None] * (max(enum) + 1)
+    for member in enum:
+        table[member.value] = member
+    return tuple(table)
 
-    def __init__(self, x: int, y: int, z: int) -> None:
-        self.x = x
-        self.y = y
-        self.z = z
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Position):
-            return NotImplemented
-        return self.x == other.x and self.y == other.y and self.z == other.z
+# Enum members by raw value, so getters can index instead of calling the
+# Enum constructor (a metaclass call plus a value-map lookup)
+_TILE_TYPES = _members_by_value(TileType)
+_TILE_FLAGS = tuple(TileFlag(v) for v in range(int(max(TileFlag)) * 2))
 
-    def __hash__(self) -> int:
-        return hash((self.x, self.y, self.z))
+# Raw flag bits for hot checks, avoiding TileFlag attribute loads
+_WALKABLE = TileFlag.WALKABLE.value
+_STAIR_UP = TileFlag.HAS_STAIR_UP.value
+_STAIR_DOWN = TileFlag.HAS_STAIR_DOWN.value
+_RAMP = TileFlag.HAS_RAMP.value
 
-    def __repr__(self) -> str:
-        return f"Position({self.x}, {self.y}, {self.z})"
+
+class Position(NamedTuple):
+    """3D position in the world."""
+    x: int
+    y: int
+    z: int
 
     def manhattan_distance(self, other: Position) -> int:
         return abs(self.x - other.x) + abs(self.y - other.y) + abs(self.z - other.z)
 
-    def to_tuple(self) -> tuple[int, int, int]:
-        return (self.x, self.y, self.z)
+
+@njit(cache=True)
+def planar_neighbors(flags: np.ndarray, x: int, y: int, z: int, out: np.ndarray) -> int:
+    """Write walkable cardinal neighbors of (x, y, z) into out as (x, y, z) rows.
+
+    Returns the number of rows written (at most 4).
+    """
+    height = flags.shape[1]
+    width = flags.shape[2]
+    n = 0
+    for dx, dy in _CARDINAL_OFFSETS:
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and flags[z, ny, nx] & _WALKABLE:
+            out[n, 0], out[n, 1], out[n, 2] = nx, ny, z
+            n += 1
+    return n
+
+
+@njit(cache=True)
+def z_neighbors(flags: np.ndarray, x: int, y: int, z: int, out: np.ndarray, n: int) -> int:
+    """Append tiles reachable from (x, y, z) by stairs or ramp to out from row n.
+
+    Returns the new row count (at most n + 2).
+    """
+    f = flags[z, y, x]
+    # Can go up via up-stairs at current tile + down-stairs at tile above
+    if f & _STAIR_UP and z + 1 < flags.shape[0]:
+        above = flags[z + 1, y, x]
+        if above & _STAIR_DOWN and above & _WALKABLE:
+            out[n, 0], out[n, 1], out[n, 2] = x, y, z + 1
+            n += 1
+    if z > 0:
+        below = flags[z - 1, y, x]
+        if below & _WALKABLE and (
+            # Down-stairs at current tile + up-stairs at tile below
+            (f & _STAIR_DOWN and below & _STAIR_UP)
+            # A ramp at this tile leads down to the tile below
+            or f & _RAMP
+        ):
+            out[n, 0], out[n, 1], out[n, 2] = x, y, z - 1
+            n += 1
+    return n
+
+
+def _positions(rows: np.ndarray, n: int) -> list[Position]:
+    return [Position(x, y, z) for x, y, z in rows[:n].tolist()]
 
 
 class WorldGrid:
@@ -59,18 +117,40 @@ class WorldGrid:
         self.flags = np.zeros((depth, height, width), dtype=np.uint16)
         # Liquid level (0-7)
         self.liquid_levels = np.zeros((depth, height, width), dtype=np.uint8)
+        # Cached WALKABLE bit of flags as a bool array, built on first use
+        self._walk_mask: np.ndarray | None = None
+
+    @property
+    def walk_mask(self) -> np.ndarray:
+        """Boolean [z, y, x] array of walkable tiles.
+
+        Kept in sync by the per-tile flag setters. Code that writes to
+        ``flags`` directly must call ``invalidate_walk_mask`` (or
+        ``refresh_walkable`` for a single tile) afterwards.
+        """
+        if self._walk_mask is None:
+            self._walk_mask = (self.flags & _WALKABLE) != 0
+        return self._walk_mask
+
+    def invalidate_walk_mask(self) -> None:
+        self._walk_mask = None
+
+    def refresh_walkable(self, x: int, y: int, z: int) -> None:
+        """Re-derive the cached walkability of one tile from its flags."""
+        if self._walk_mask is not None:
+            self._walk_mask[z, y, x] = bool(self.flags[z, y, x] & _WALKABLE)
 
     def in_bounds(self, x: int, y: int, z: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height and 0 <= z < self.depth
 
     def get_wall_type(self, x: int, y: int, z: int) -> TileType:
-        return TileType(self.wall_types[z, y, x])
+        return _TILE_TYPES[self.wall_types[z, y, x]]
 
     def get_floor_type(self, x: int, y: int, z: int) -> TileType:
-        return TileType(self.floor_types[z, y, x])
+        return _TILE_TYPES[self.floor_types[z, y, x]]
 
     def get_flags(self, x: int, y: int, z: int) -> TileFlag:
-        return TileFlag(int(self.flags[z, y, x]))
+        return _TILE_FLAGS[self.flags[z, y, x]]
 
     def set_wall_type(self, x: int, y: int, z: int, wall_type: TileType) -> None:
         self.wall_types[z, y, x] = wall_type.value
@@ -80,69 +160,61 @@ class WorldGrid:
 
     def set_flags(self, x: int, y: int, z: int, flags: TileFlag) -> None:
         self.flags[z, y, x] = flags.value
+        self.refresh_walkable(x, y, z)
 
     def add_flag(self, x: int, y: int, z: int, flag: TileFlag) -> None:
         self.flags[z, y, x] |= flag.value
+        self.refresh_walkable(x, y, z)
 
     def remove_flag(self, x: int, y: int, z: int, flag: TileFlag) -> None:
         self.flags[z, y, x] = int(self.flags[z, y, x]) & ~flag.value
+        self.refresh_walkable(x, y, z)
 
     def has_flag(self, x: int, y: int, z: int, flag: TileFlag) -> bool:
         return bool(self.flags[z, y, x] & flag.value)
 
+    def count_flag(self, flag: TileFlag, z: int | None = None) -> int:
+        """Count tiles with any bit of flag set, on z-level z or in the whole grid."""
+        flags = self.flags if z is None else self.flags[z]
+        return int(np.count_nonzero(flags & flag.value))
+
     def is_walkable(self, x: int, y: int, z: int) -> bool:
-        if not self.in_bounds(x, y, z):
-            return False
-        return self.has_flag(x, y, z, TileFlag.WALKABLE)
+        return (
+            0 <= x < self.width and 0 <= y < self.height and 0 <= z < self.depth
+            and bool(self.flags[z, y, x] & _WALKABLE)
+        )
 
     def get_neighbors_2d(self, x: int, y: int, z: int) -> list[Position]:
         """Get walkable cardinal neighbors on the same z-level."""
-        neighbors = []
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if self.is_walkable(nx, ny, z):
-                neighbors.append(Position(nx, ny, z))
-        return neighbors
+        # The kernels index flags unchecked, so reject off-grid tiles here
+        if not self.in_bounds(x, y, z):
+            return []
+        out = np.empty((4, 3), dtype=np.int64)
+        return _positions(out, planar_neighbors(self.flags, x, y, z, out))
 
     def get_neighbors_3d(self, x: int, y: int, z: int) -> list[Position]:
         """Get walkable neighbors including z-level transitions via stairs/ramps."""
-        neighbors = self.get_neighbors_2d(x, y, z)
-
-        # Check stair transitions
-        flags = self.get_flags(x, y, z)
-
-        # Can go up via up-stairs at current tile + down-stairs at tile above
-        if TileFlag.HAS_STAIR_UP in flags:
-            above_z = z + 1
-            if self.in_bounds(x, y, above_z) and self.has_flag(x, y, above_z, TileFlag.HAS_STAIR_DOWN):
-                if self.is_walkable(x, y, above_z):
-                    neighbors.append(Position(x, y, above_z))
-
-        # Can go down via down-stairs at current tile + up-stairs at tile below
-        if TileFlag.HAS_STAIR_DOWN in flags:
-            below_z = z - 1
-            if self.in_bounds(x, y, below_z) and self.has_flag(x, y, below_z, TileFlag.HAS_STAIR_UP):
-                if self.is_walkable(x, y, below_z):
-                    neighbors.append(Position(x, y, below_z))
-
-        # Can go down via ramp (ramp at this tile means you can walk to z-1 neighbors)
-        if TileFlag.HAS_RAMP in flags:
-            below_z = z - 1
-            if self.in_bounds(x, y, below_z) and self.is_walkable(x, y, below_z):
-                neighbors.append(Position(x, y, below_z))
-
-        return neighbors
+        if not self.in_bounds(x, y, z):
+            return []
+        out = np.empty((6, 3), dtype=np.int64)
+        n = planar_neighbors(self.flags, x, y, z, out)
+        return _positions(out, z_neighbors(self.flags, x, y, z, out, n))
 
     def get_tiles_in_rect(
         self, x1: int, y1: int, x2: int, y2: int, z: int
-    ) -> list[Position]:
-        """Get all positions in a rectangle on a given z-level."""
-        positions = []
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            for x in range(min(x1, x2), max(x1, x2) + 1):
-                if self.in_bounds(x, y, z):
-                    positions.append(Position(x, y, z))
-        return positions
+    ) -> np.ndarray:
+        """Get all in-bounds tiles in a rectangle on a given z-level.
+
+        Returns an (N, 3) int32 array of (x, y, z) rows in row-major order.
+        """
+        x_lo, x_hi = max(min(x1, x2), 0), min(max(x1, x2), self.width - 1)
+        y_lo, y_hi = max(min(y1, y2), 0), min(max(y1, y2), self.height - 1)
+        if x_lo > x_hi or y_lo > y_hi or not 0 <= z < self.depth:
+            return np.empty((0, 3), dtype=np.int32)
+        ys, xs = np.mgrid[y_lo:y_hi + 1, x_lo:x_hi + 1]
+        return np.stack(
+            (xs.ravel(), ys.ravel(), np.full(xs.size, z)), axis=1
+        ).astype(np.int32, copy=False)
 
     def dig_tile(self, x: int, y: int, z: int) -> TileType:
         """Dig out a tile: remove wall, make walkable, add floor. Returns old wall type."""
@@ -160,6 +232,20 @@ class WorldGrid:
                 self.add_flag(x, y, above_z, TileFlag.HAS_FLOOR)
         return old_wall
 
+    def dig_tiles(self, mask: np.ndarray, z: int) -> None:
+        """Dig out every tile of z-level z where the [y, x] bool mask is set.
+
+        Same effect as dig_tile on each masked tile, in a few array operations.
+        """
+        self.wall_types[z][mask] = TileType.AIR
+        self.flags[z][mask] = (TileFlag.WALKABLE | TileFlag.HAS_FLOOR).value
+        if self._walk_mask is not None:
+            self._walk_mask[z][mask] = True
+        # Ensure tiles above have a floor where they are also air
+        if z + 1 < self.depth:
+            open_above = mask & (self.wall_types[z + 1] == TileType.AIR)
+            self.flags[z + 1][open_above] |= TileFlag.HAS_FLOOR.value
+
     def channel_tile(self, x: int, y: int, z: int) -> TileType:
         """Channel a tile: remove wall AND floor, creating a hole. Returns old wall type."""
         old_wall = self.get_wall_type(x, y, z)
@@ -207,3 +293,13 @@ class WorldGrid:
             TileFlag.WALKABLE | TileFlag.HAS_FLOOR | TileFlag.HAS_STAIR_UP | TileFlag.HAS_STAIR_DOWN,
         )
         return old_wall
+
+
+def warm_up_neighbor_kernels() -> None:
+    """Compile, or load from Numba's on-disk cache, the neighbor kernels.
+
+    Blocking: the first call can take seconds on a cold cache, so run it off
+    the event loop before the game loop starts.
+    """
+    grid = WorldGrid(width=2, height=2, depth=2)
+    grid.get_neighbors_3d(0, 0, 0)
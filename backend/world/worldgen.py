@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import random
+import functools
 
 import numpy as np
 
@@ -18,72 +18,104 @@ def generate_world(
     seed: int | None = None,
 ) -> WorldGrid:
     """Generate a new world with terrain, ores, and caverns."""
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-
+    rng = np.random.default_rng(seed)
     grid = WorldGrid(width, height, depth)
 
     _generate_terrain(grid)
-    _generate_ores(grid)
-    _generate_caverns(grid)
-    _generate_water(grid)
+    _generate_ores(grid, rng)
+    _generate_caverns(grid, rng)
+    _generate_water(grid, rng)
 
     return grid
 
 
+# Terrain layers, indexing the per-layer lookup tables below
+_SKY, _SURFACE, _SOIL, _STONE = range(4)
+# Sky is empty air; the surface is open air with a walkable grass floor;
+# soil and stone are solid and diggable
+_LAYER_WALL = np.array([TileType.AIR, TileType.AIR, TileType.SOIL, TileType.STONE], dtype=np.uint8)
+_LAYER_FLOOR = np.array([TileType.AIR, TileType.GRASS, TileType.SOIL, TileType.STONE], dtype=np.uint8)
+_LAYER_FLAGS = np.array([
+    TileFlag.NONE,
+    TileFlag.WALKABLE | TileFlag.HAS_FLOOR,
+    TileFlag.DIGGABLE,
+    TileFlag.DIGGABLE,
+], dtype=np.uint16)
+
+
 def _generate_terrain(grid: WorldGrid) -> None:
     """Generate basic terrain layers."""
     soil_depth = 4  # layers of soil below surface
 
-    for z in range(grid.depth):
-        if z > SURFACE_Z:
-            # Sky: empty air
-            grid.wall_types[z, :, :] = TileType.AIR
-            grid.flags[z, :, :] = TileFlag.NONE
-        elif z == SURFACE_Z:
-            # Surface: open air with grass floor, walkable
-            grid.wall_types[z, :, :] = TileType.AIR
-            grid.floor_types[z, :, :] = TileType.GRASS
-            grid.flags[z, :, :] = TileFlag.WALKABLE | TileFlag.HAS_FLOOR
-        elif z > SURFACE_Z - soil_depth:
-            # Soil layers (solid, diggable)
-            grid.wall_types[z, :, :] = TileType.SOIL
-            grid.floor_types[z, :, :] = TileType.SOIL
-            grid.flags[z, :, :] = TileFlag.DIGGABLE
-        else:
-            # Stone layers (solid, diggable)
-            grid.wall_types[z, :, :] = TileType.STONE
-            grid.floor_types[z, :, :] = TileType.STONE
-            grid.flags[z, :, :] = TileFlag.DIGGABLE
-
-
-def _generate_ores(grid: WorldGrid) -> None:
+    z = np.arange(grid.depth)
+    layer = np.select(
+        [z > SURFACE_Z, z == SURFACE_Z, z > SURFACE_Z - soil_depth],
+        [_SKY, _SURFACE, _SOIL],
+        _STONE,
+    )
+    grid.wall_types[:] = _LAYER_WALL[layer][:, None, None]
+    grid.floor_types[:] = _LAYER_FLOOR[layer][:, None, None]
+    grid.flags[:] = _LAYER_FLAGS[layer][:, None, None]
+    grid.invalidate_walk_mask()
+
+
+@functools.lru_cache(maxsize=64)
+def _disk_mask(rx: tuple[int, int], ry: tuple[int, int], radius_sq: int) -> np.ndarray:
+    """Read-only [dy, dx] mask of the offsets in the inclusive ranges rx/ry
+    with dx^2 + dy^2 <= radius_sq.
+
+    Room and pool sizes come from small ranges, so masks repeat often.
+    """
+    dy, dx = np.ogrid[ry[0]:ry[1] + 1, rx[0]:rx[1] + 1]
+    mask = dx * dx + dy * dy <= radius_sq
+    mask.flags.writeable = False
+    return mask
+
+
+def _disk(
+    grid: WorldGrid,
+    cx: int,
+    cy: int,
+    rx: tuple[int, int],
+    ry: tuple[int, int],
+    radius_sq: int,
+) -> tuple[slice, slice, np.ndarray]:
+    """_disk_mask placed around (cx, cy) and clipped to the grid.
+
+    Returns (y slice, x slice, mask) for indexing a [y, x] plane.
+    """
+    left, top = cx + rx[0], cy + ry[0]
+    x0, x1 = max(0, left), min(grid.width, cx + rx[1] + 1)
+    y0, y1 = max(0, top), min(grid.height, cy + ry[1] + 1)
+    mask = _disk_mask(rx, ry, radius_sq)
+    return slice(y0, y1), slice(x0, x1), mask[y0 - top:y1 - top, x0 - left:x1 - left]
+
+
+def _generate_ores(grid: WorldGrid, rng: np.random.Generator) -> None:
     """Sprinkle ore veins in stone layers."""
     ore_types = [TileType.IRON_ORE, TileType.COPPER_ORE, TileType.GOLD_ORE]
     ore_counts = [30, 25, 10]  # number of clusters per ore type
+    max_cluster = 8
 
     for ore_type, count in zip(ore_types, ore_counts):
         max_z = min(SURFACE_Z - 5, grid.depth - 2)
         if max_z < 1 or grid.width < 12 or grid.height < 12:
             continue
-        for _ in range(count):
-            # Pick a random center in stone layers
-            cx = random.randint(5, grid.width - 6)
-            cy = random.randint(5, grid.height - 6)
-            cz = random.randint(1, max_z)
-
-            # Create a small cluster (3-8 tiles)
-            cluster_size = random.randint(3, 8)
-            for _ in range(cluster_size):
-                ox = cx + random.randint(-2, 2)
-                oy = cy + random.randint(-2, 2)
-                oz = cz + random.randint(-1, 1)
-                if grid.in_bounds(ox, oy, oz) and grid.get_wall_type(ox, oy, oz) == TileType.STONE:
-                    grid.set_wall_type(ox, oy, oz, ore_type)
-
-
-def _generate_caverns(grid: WorldGrid) -> None:
+
+        # Random centers in stone layers, each with a small cluster (3-8 tiles)
+        centers = rng.integers([5, 5, 1], [grid.width - 5, grid.height - 5, max_z + 1], size=(count, 3))
+        sizes = rng.integers(3, max_cluster + 1, size=count)
+        # Spread of +-2 tiles in x/y and +-1 z-level
+        offsets = rng.integers([-2, -2, -1], [3, 3, 2], size=(count, max_cluster, 3))
+        tiles = (centers[:, None, :] + offsets)[np.arange(max_cluster) < sizes[:, None]]
+
+        # Centers sit far enough from every edge that each tile is in bounds
+        idx = np.ravel_multi_index(tiles.T[::-1], grid.wall_types.shape)
+        flat = grid.wall_types.ravel()
+        flat[idx[flat[idx] == TileType.STONE]] = ore_type
+
+
+def _generate_caverns(grid: WorldGrid, rng: np.random.Generator) -> None:
     """Create 1-2 cavern layers."""
     cavern_depths = [15, 8]  # z-levels for cavern ceilings
 
@@ -96,45 +128,38 @@ def _generate_caverns(grid: WorldGrid) -> None:
         if margin < 2 or grid.width - margin - 1 < margin or grid.height - margin - 1 < margin:
             continue
 
-        # Create irregular cavern shape using random walk
-        num_rooms = random.randint(3, 6)
-        for _ in range(num_rooms):
-            cx = random.randint(margin, grid.width - margin - 1)
-            cy = random.randint(margin, grid.height - margin - 1)
-            room_w = random.randint(4, 12)
-            room_h = random.randint(4, 12)
-
-            for dy in range(-room_h // 2, room_h // 2 + 1):
-                for dx in range(-room_w // 2, room_w // 2 + 1):
-                    x, y = cx + dx, cy + dy
-                    if not grid.in_bounds(x, y, cavern_z):
-                        continue
-                    # Rounded edges
-                    if dx * dx + dy * dy > (max(room_w, room_h) // 2 + 1) ** 2:
-                        continue
-                    grid.dig_tile(x, y, cavern_z)
-
-
-def _generate_water(grid: WorldGrid) -> None:
+        # Irregular cavern shape from overlapping rounded rooms
+        dig = np.zeros((grid.height, grid.width), dtype=bool)
+        num_rooms = int(rng.integers(3, 7))
+        # Center x, center y, width, height per room
+        rooms = rng.integers(
+            [margin, margin, 4, 4],
+            [grid.width - margin, grid.height - margin, 13, 13],
+            size=(num_rooms, 4),
+        )
+        for cx, cy, room_w, room_h in rooms.tolist():
+            ys, xs, mask = _disk(
+                grid, cx, cy,
+                (-room_w // 2, room_w // 2),
+                (-room_h // 2, room_h // 2),
+                (max(room_w, room_h) // 2 + 1) ** 2,
+            )
+            dig[ys, xs] |= mask
+
+        grid.dig_tiles(dig, cavern_z)
+
+
+def _generate_water(grid: WorldGrid, rng: np.random.Generator) -> None:
     """Create a few surface water pools."""
-    if grid.width < 22 or grid.height < 22:
+    if grid.width < 22 or grid.height < 22 or SURFACE_Z >= grid.depth:
         return
 
-    num_pools = random.randint(1, 3)
-
-    for _ in range(num_pools):
-        cx = random.randint(10, grid.width - 11)
-        cy = random.randint(10, grid.height - 11)
-        pool_r = random.randint(2, 5)
-
-        for dy in range(-pool_r, pool_r + 1):
-            for dx in range(-pool_r, pool_r + 1):
-                if dx * dx + dy * dy > pool_r * pool_r:
-                    continue
-                x, y = cx + dx, cy + dy
-                z = SURFACE_Z
-                if not grid.in_bounds(x, y, z):
-                    continue
-                grid.set_wall_type(x, y, z, TileType.WATER)
-                grid.set_floor_type(x, y, z, TileType.WATER)
-                grid.set_flags(x, y, z, TileFlag.HAS_FLOOR)
+    num_pools = int(rng.integers(1, 4))
+    # Center x, center y, radius per pool
+    pools = rng.integers([10, 10, 2], [grid.width - 10, grid.height - 10, 6], size=(num_pools, 3))
+    for cx, cy, pool_r in pools.tolist():
+        ys, xs, mask = _disk(grid, cx, cy, (-pool_r, pool_r), (-pool_r, pool_r), pool_r * pool_r)
+        grid.wall_types[SURFACE_Z, ys, xs][mask] = TileType.WATER
+        grid.floor_types[SURFACE_Z, ys, xs][mask] = TileType.WATER
+        grid.flags[SURFACE_Z, ys, xs][mask] = TileFlag.HAS_FLOOR
+    grid.invalidate_walk_mask()
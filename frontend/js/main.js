@@ -28,6 +28,7 @@ function connect() {
     const statusEl = document.getElementById("connection-status");
 
     ws = new WebSocket(WS_URL);
+    ws.binaryType = "arraybuffer";
 
     ws.onopen = () => {
         statusEl.textContent = "Connected";
@@ -39,6 +40,12 @@ function connect() {
     };
 
     ws.onmessage = (event) => {
+        // Tile data arrives as binary frames, everything else as JSON
+        if (event.data instanceof ArrayBuffer) {
+            state.handleBinaryMessage(event.data);
+            return;
+        }
+
         const data = JSON.parse(event.data);
         state.handleMessage(data);
 
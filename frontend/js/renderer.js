@@ -100,26 +100,24 @@ export class Renderer {
 
         if (!this.state.tiles) return;
 
-        const tiles = this.state.tiles;
+        const { w: walls, f: floors, fl: flags } = this.state.tiles;
+        const width = this.state.width;
 
         // Draw tiles
         for (let sy = 0; sy < this.tilesHigh; sy++) {
             const wy = this.viewY + sy;
             if (wy < 0 || wy >= this.state.height) continue;
-            const row = tiles[wy];
-            if (!row) continue;
+            const rowStart = wy * width;
 
             for (let sx = 0; sx < this.tilesWide; sx++) {
                 const wx = this.viewX + sx;
-                if (wx < 0 || wx >= this.state.width) continue;
-
-                const tile = row[wx];
-                if (!tile) continue;
+                if (wx < 0 || wx >= width) continue;
 
                 const px = sx * this.tileW;
                 const py = sy * this.tileH;
+                const idx = rowStart + wx;
 
-                this.drawTile(ctx, tile, px, py);
+                this.drawTile(ctx, walls[idx], floors[idx], flags[idx], px, py);
             }
         }
 
@@ -172,9 +170,7 @@ export class Renderer {
         }
     }
 
-    drawTile(ctx, tile, px, py) {
-        const wallType = tile.w;
-        const flags = tile.fl;
+    drawTile(ctx, wallType, groundType, flags, px, py) {
 
         // Determine what to display
         let ch, fg;
@@ -201,7 +197,6 @@ export class Renderer {
             fg = display.fg;
         } else if (flags & FLAG_HAS_FLOOR) {
             // Open space with floor - show floor material
-            const groundType = tile.f;
             const floorDisplay = FLOOR_DISPLAY[groundType] || { ch: "·", fg: "#444" };
             ch = floorDisplay.ch;
             fg = floorDisplay.fg;
@@ -2,6 +2,14 @@
  * Client-side game state. Stores world data received from the server
  * and applies deltas.
  */
+
+// First byte of binary frames - mirrors BinaryMessageType in serialization.py
+const BINARY_Z_LEVEL = 1;
+const BINARY_TILE_DELTA = 2;
+
+const Z_LEVEL_HEADER_SIZE = 8;
+const TILE_DELTA_HEADER_SIZE = 8;
+
 export class GameState {
     constructor() {
         this.width = 0;
@@ -10,7 +18,8 @@ export class GameState {
         this.surfaceZ = 0;
         this.currentZ = 0;
 
-        // Current z-level tile data: tiles[y][x] = {w, f, fl}
+        // Current z-level tile data as parallel flat arrays indexed
+        // y * width + x: {w: Uint8Array, f: Uint8Array, fl: Uint16Array}
         this.tiles = null;
 
         // Creatures: id -> {x, y, z, type, name, char, color}
@@ -38,11 +47,6 @@ export class GameState {
                 }
                 break;
 
-            case "z_level":
-                this.tiles = data.tiles;
-                this.currentZ = data.z;
-                break;
-
             case "delta":
                 this.applyDelta(data);
                 break;
@@ -53,19 +57,44 @@ export class GameState {
         }
     }
 
-    applyDelta(delta) {
-        if (delta.tiles) {
-            for (const tile of delta.tiles) {
-                if (tile.z === this.currentZ && this.tiles) {
-                    this.tiles[tile.y][tile.x] = {
-                        w: tile.wall,
-                        f: tile.floor,
-                        fl: tile.flags,
-                    };
+    handleBinaryMessage(buffer) {
+        const view = new DataView(buffer);
+        switch (view.getUint8(0)) {
+            case BINARY_Z_LEVEL: {
+                const z = view.getUint16(2, true);
+                const width = view.getUint16(4, true);
+                const height = view.getUint16(6, true);
+                const size = width * height;
+                let offset = Z_LEVEL_HEADER_SIZE;
+                const w = new Uint8Array(buffer, offset, size);
+                offset += size;
+                const f = new Uint8Array(buffer, offset, size);
+                offset += size;
+                const fl = new Uint16Array(buffer, offset, size);
+                this.tiles = { w, f, fl };
+                this.currentZ = z;
+                break;
+            }
+
+            case BINARY_TILE_DELTA: {
+                if (!this.tiles) break;
+                const count = view.getUint32(4, true);
+                // Parallel arrays: x, y, z, flags (uint16), wall, floor (uint8)
+                const u16 = new Uint16Array(buffer, TILE_DELTA_HEADER_SIZE, 4 * count);
+                const u8 = new Uint8Array(buffer, TILE_DELTA_HEADER_SIZE + 8 * count, 2 * count);
+                for (let i = 0; i < count; i++) {
+                    if (u16[2 * count + i] !== this.currentZ) continue;
+                    const idx = u16[count + i] * this.width + u16[i];
+                    this.tiles.fl[idx] = u16[3 * count + i];
+                    this.tiles.w[idx] = u8[i];
+                    this.tiles.f[idx] = u8[count + i];
                 }
+                break;
             }
         }
+    }
 
+    applyDelta(delta) {
         if (delta.creatures) {
             for (const c of delta.creatures) {
                 if (c.removed) {
@@ -5,24 +5,23 @@ import pytest
 from backend.entities.creature import (
     Animal,
     Creature,
+    CreatureNeeds,
     CreatureType,
     Dwarf,
     LaborType,
 )
-from backend.simulation.creature_system import CreatureSystem
+from backend.simulation.creature_system import AI_DECISION_INTERVAL, CreatureSystem
 from backend.simulation.game_state import GameState
 from backend.world.grid import Position, WorldGrid
 from backend.world.tile import TileFlag
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def walkable_world():
-    """A small world with a walkable surface layer."""
+    """A small world with a walkable surface layer, shared read-only."""
     grid = WorldGrid(width=20, height=20, depth=10)
     # Make z=5 a walkable surface
-    for y in range(20):
-        for x in range(20):
-            grid.set_flags(x, y, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+    grid.flags[5] = (TileFlag.WALKABLE | TileFlag.HAS_FLOOR).value
     return grid
 
 
@@ -38,6 +37,13 @@ class TestCreatureNeeds:
         assert dwarf.thirst == 100.0
         assert dwarf.energy == 100.0
 
+    def test_store_fields_grow_together(self):
+        needs = CreatureNeeds(capacity=1)
+        needs.allocate()
+        needs.allocate()  # Forces a grow
+        for name in (*CreatureNeeds.FLOAT_FIELDS, "alive", "reported"):
+            assert len(getattr(needs, name)) == needs.capacity == 2
+
     def test_needs_decay_per_tick(self):
         dwarf = Dwarf("Urist", Position(5, 5, 5))
         dwarf.tick_needs()
@@ -133,6 +139,13 @@ class TestCreatureTypes:
         assert char == "@"
         assert color == "#fff"
 
+    def test_creature_ids_are_unique_ints(self):
+        a = Dwarf("A", Position(0, 0, 0))
+        b = Dwarf("B", Position(0, 0, 0))
+        assert isinstance(a.id, int)
+        assert b.id > a.id
+        assert a.serialize()["id"] == a.id
+
     def test_creature_serialize(self):
         dwarf = Dwarf("Urist", Position(3, 4, 5))
         data = dwarf.serialize()
@@ -177,6 +190,17 @@ class TestCreatureSystem:
         found = system.get_at_position(pos)
         assert len(found) == 0
 
+    def test_spatial_index_shared_cell(self):
+        system = CreatureSystem(width=20, height=20)
+        pos = Position(19, 3, 2)
+        a, b = Dwarf("A", pos), Dwarf("B", pos)
+        system.add_creature(a)
+        system.add_creature(b)
+        assert system.get_at_position(pos) == [a, b]
+        assert system.get_at_position(Position(0, 4, 2)) == []
+        system.remove_creature(a.id)
+        assert system.get_at_position(pos) == [b]
+
     def test_move_updates_spatial(self):
         system = CreatureSystem()
         old_pos = Position(5, 5, 5)
@@ -210,6 +234,93 @@ class TestCreatureSystem:
         await game_state.creature_system.tick(game_state, 1)
         assert dwarf.position == Position(6, 5, 5)
 
+    @pytest.mark.asyncio
+    async def test_tick_kills_starving_creature(self, game_state):
+        starving = Dwarf("Urist", Position(5, 5, 5))
+        healthy = Dwarf("Doren", Position(6, 5, 5))
+        game_state.creature_system.add_creature(starving)
+        game_state.creature_system.add_creature(healthy)
+        starving.hunger = 0.01
+        await game_state.creature_system.tick(game_state, 1)
+        assert not starving.alive
+        assert healthy.alive
+
+    @pytest.mark.asyncio
+    async def test_ai_decisions_are_staggered(self, game_state, monkeypatch):
+        decisions = []
+
+        async def record(creature, state):
+            decisions.append((creature.name, tick))
+
+        monkeypatch.setattr("backend.simulation.creature_system.decide_action", record)
+        system = game_state.creature_system
+        for phase, name in enumerate(("A", "B", "C")):
+            dwarf = Dwarf(name, Position(phase, 0, 5))
+            dwarf.ai_phase = phase
+            system.add_creature(dwarf)
+
+        for tick in range(1, AI_DECISION_INTERVAL * 2 + 1):
+            await system.tick(game_state, tick)
+        assert sorted(decisions) == [
+            ("A", AI_DECISION_INTERVAL), ("A", AI_DECISION_INTERVAL * 2),
+            ("B", 1), ("B", AI_DECISION_INTERVAL + 1),
+            ("C", 2), ("C", AI_DECISION_INTERVAL + 2),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_changes_during_tick_are_deferred(self, game_state, monkeypatch):
+        system = game_state.creature_system
+        doomed = Dwarf("Urist", Position(0, 0, 5))
+        newcomer = Dwarf("Doren", Position(1, 0, 5))
+        doomed.ai_phase = 0
+        system.add_creature(doomed)
+
+        async def churn(creature, state):
+            system.remove_creature(doomed.id)
+            system.add_creature(newcomer)
+
+        monkeypatch.setattr("backend.simulation.creature_system.decide_action", churn)
+        await system.tick(game_state, AI_DECISION_INTERVAL)
+        assert list(system.creatures) == [newcomer.id]
+        assert system.get_at_position(Position(0, 0, 5)) == []
+        assert system.get_at_position(Position(1, 0, 5)) == [newcomer]
+
+    @pytest.mark.asyncio
+    async def test_deferred_changes_keep_call_order(self, game_state, monkeypatch):
+        system = game_state.creature_system
+        ticker = Dwarf("Urist", Position(0, 0, 5))
+        transient = Dwarf("Doren", Position(1, 0, 5))
+        ticker.ai_phase = 0
+        system.add_creature(ticker)
+
+        async def add_then_remove(creature, state):
+            system.add_creature(transient)
+            system.remove_creature(transient.id)
+
+        monkeypatch.setattr("backend.simulation.creature_system.decide_action", add_then_remove)
+        await system.tick(game_state, AI_DECISION_INTERVAL)
+        assert list(system.creatures) == [ticker.id]
+        assert system.get_at_position(Position(1, 0, 5)) == []
+
+    def test_needs_survive_store_growth(self):
+        system = CreatureSystem()
+        dwarves = [Dwarf(str(i), Position(i, 0, 0)) for i in range(40)]
+        for i, dwarf in enumerate(dwarves):
+            dwarf.hunger = float(i)
+            system.add_creature(dwarf)
+        assert [d.hunger for d in dwarves] == [float(i) for i in range(40)]
+
+    def test_removed_creature_keeps_needs(self):
+        system = CreatureSystem()
+        cat = Animal("Mittens", CreatureType.CAT, Position(0, 0, 0))
+        system.add_creature(cat)
+        cat.thirst = 42.0
+        system.remove_creature(cat.id)
+        assert cat.thirst == 42.0
+        assert cat.hunger_decay == 0.01
+        cat.tick_needs()
+        assert cat.thirst == pytest.approx(42.0 - 0.015)
+
     def test_serialize_all(self):
         system = CreatureSystem()
         system.add_creature(Dwarf("A", Position(0, 0, 0)))
@@ -218,3 +329,49 @@ class TestCreatureSystem:
         assert len(data) == 2
         names = {d["name"] for d in data}
         assert names == {"A", "B"}
+
+
+class TestSerializeChanged:
+    def test_first_call_sends_everyone(self):
+        system = CreatureSystem()
+        system.add_creature(Dwarf("A", Position(0, 0, 0)))
+        system.add_creature(Dwarf("B", Position(1, 0, 0)))
+        assert {d["name"] for d in system.serialize_changed()} == {"A", "B"}
+        assert system.serialize_changed() == []
+
+    def test_move_marks_changed(self):
+        system = CreatureSystem()
+        dwarf = Dwarf("A", Position(0, 0, 0))
+        system.add_creature(dwarf)
+        system.add_creature(Dwarf("B", Position(1, 0, 0)))
+        system.serialize_changed()
+        system._move_creature(dwarf, Position(0, 1, 0))
+        assert [d["name"] for d in system.serialize_changed()] == ["A"]
+
+    def test_small_need_drift_is_not_sent(self):
+        system = CreatureSystem()
+        dwarf = Dwarf("A", Position(0, 0, 0))
+        system.add_creature(dwarf)
+        dwarf.hunger = 99.0
+        system.serialize_changed()
+        dwarf.hunger = 96.0
+        assert system.serialize_changed() == []
+        dwarf.hunger = 94.0
+        assert [d["hunger"] for d in system.serialize_changed()] == [94.0]
+
+    def test_death_marks_changed(self):
+        system = CreatureSystem()
+        dwarf = Dwarf("A", Position(0, 0, 0))
+        system.add_creature(dwarf)
+        system.serialize_changed()
+        dwarf.alive = False
+        assert [d["alive"] for d in system.serialize_changed()] == [False]
+
+    def test_removal_is_reported_once(self):
+        system = CreatureSystem()
+        dwarf = Dwarf("A", Position(0, 0, 0))
+        system.add_creature(dwarf)
+        system.serialize_changed()
+        system.remove_creature(dwarf.id)
+        assert system.serialize_changed() == [{"id": dwarf.id, "removed": True}]
+        assert system.serialize_changed() == []
@@ -0,0 +1,33 @@
+"""Tests for need-based creature decisions."""
+
+import pytest
+
+from backend.ai.decision import _wander
+from backend.entities.creature import Dwarf
+from backend.simulation.game_state import GameState
+from backend.world.grid import Position, WorldGrid
+from backend.world.tile import TileFlag
+
+
+class TestWander:
+    @pytest.mark.asyncio
+    async def test_wanders_to_nearby_walkable_tile(self):
+        grid = WorldGrid(width=10, height=10, depth=3)
+        for x in range(10):
+            grid.set_flags(x, 0, 1, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+        dwarf = Dwarf("Urist", Position(0, 0, 1))
+
+        await _wander(dwarf, GameState(grid))
+        target = dwarf.current_path[-1]
+        assert target.y == 0 and target.z == 1
+        assert 1 <= target.x <= 3
+        assert dwarf.path_index == 1
+
+    @pytest.mark.asyncio
+    async def test_no_walkable_neighbors(self):
+        grid = WorldGrid(width=10, height=10, depth=3)
+        grid.set_flags(5, 5, 1, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+        dwarf = Dwarf("Urist", Position(5, 5, 1))
+
+        await _wander(dwarf, GameState(grid))
+        assert dwarf.current_path == []
@@ -0,0 +1,41 @@
+"""Tests for the fixed-timestep game loop."""
+
+import pytest
+
+from backend.config import BROADCAST_INTERVAL, TICK_INTERVAL
+from backend.simulation.game_loop import GameLoop
+from backend.simulation.game_state import GameState
+
+
+class TestBroadcastRate:
+    @pytest.mark.asyncio
+    async def test_broadcasts_coalesce_ticks(self, small_grid):
+        loop = GameLoop(GameState(small_grid))
+        broadcasts = []
+
+        async def record() -> None:
+            broadcasts.append(loop.tick_count)
+
+        loop._broadcast = record
+        ticks_per_broadcast = round(BROADCAST_INTERVAL / TICK_INTERVAL)
+        for _ in range(ticks_per_broadcast * 10):
+            await loop._tick()
+
+        assert len(broadcasts) == 10
+        assert broadcasts[0] == ticks_per_broadcast
+
+    @pytest.mark.asyncio
+    async def test_skipped_ticks_keep_changed_tiles(self, small_grid):
+        state = GameState(small_grid)
+        loop = GameLoop(state)
+        popped = []
+
+        async def record() -> None:
+            popped.append(len(state.pop_changed_tiles()))
+
+        loop._broadcast = record
+        state.mark_tile_changed(1, 1, 1)
+        await loop._tick()
+        state.mark_tile_changed(2, 2, 2)
+        await loop._tick()
+        assert popped == [2]
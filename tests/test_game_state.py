@@ -0,0 +1,25 @@
+"""Tests for the central game state container."""
+
+from backend.simulation.game_state import GameState
+
+
+class TestChangedTiles:
+    def test_pop_returns_flat_indices(self, small_grid):
+        state = GameState(small_grid)
+        state.mark_tile_changed(1, 2, 3)
+        state.mark_tile_changed(4, 5, 6)
+        changed = state.pop_changed_tiles()
+        w, h = small_grid.width, small_grid.height
+        assert sorted(changed.tolist()) == [(3 * h + 2) * w + 1, (6 * h + 5) * w + 4]
+
+    def test_pop_clears(self, small_grid):
+        state = GameState(small_grid)
+        state.mark_tile_changed(1, 2, 3)
+        state.pop_changed_tiles()
+        assert len(state.pop_changed_tiles()) == 0
+
+    def test_repeated_marks_deduplicate(self, small_grid):
+        state = GameState(small_grid)
+        for _ in range(3):
+            state.mark_tile_changed(1, 1, 1)
+        assert len(state.pop_changed_tiles()) == 1
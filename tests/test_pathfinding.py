@@ -1,41 +1,65 @@
 """Tests for A* pathfinding on the 3D grid."""
 
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
 import pytest
 
+from backend.ai import pathfinding
 from backend.ai.pathfinding import _find_path_sync, find_path
 from backend.world.grid import Position, WorldGrid
 from backend.world.tile import TileFlag
 
 
-@pytest.fixture
-def flat_grid():
+FLOOR = (TileFlag.WALKABLE | TileFlag.HAS_FLOOR).value
+
+
+def _make_flat_grid() -> WorldGrid:
     """A 20x20 world with a walkable flat surface at z=5."""
     grid = WorldGrid(width=20, height=20, depth=10)
-    for y in range(20):
-        for x in range(20):
-            grid.set_flags(x, y, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+    grid.flags[5] = FLOOR
     return grid
 
 
+@pytest.fixture(scope="session")
+def flat_grid():
+    """Shared read-only flat grid; tests that edit tiles build their own."""
+    return _make_flat_grid()
+
+
 @pytest.fixture
-def grid_with_wall(flat_grid):
+def grid_with_wall():
     """Flat grid with a wall blocking the path at x=10."""
-    for y in range(20):
-        flat_grid.set_flags(10, y, 5, TileFlag.NONE)
+    grid = _make_flat_grid()
+    grid.flags[5, :, 10] = TileFlag.NONE.value
     # Leave a gap at y=15
-    flat_grid.set_flags(10, 15, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
-    return flat_grid
+    grid.flags[5, 15, 10] = FLOOR
+    return grid
 
 
 @pytest.fixture
+def search_threads(monkeypatch):
+    """Names of the threads each _find_path_sync call runs on, kernels warm."""
+    pathfinding.warm_up_kernels()
+    threads = []
+    search = pathfinding._find_path_sync
+
+    def record(*args):
+        threads.append(threading.current_thread().name)
+        return search(*args)
+
+    monkeypatch.setattr(pathfinding, "_find_path_sync", record)
+    return threads
+
+
+@pytest.fixture(scope="session")
 def grid_with_stairs():
     """Grid with stair connections between z=5 and z=6."""
     grid = WorldGrid(width=10, height=10, depth=10)
     # Walkable surfaces at z=5 and z=6
-    for y in range(10):
-        for x in range(10):
-            grid.set_flags(x, y, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
-            grid.set_flags(x, y, 6, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+    grid.flags[5:7] = FLOOR
     # Stair at (5, 5)
     grid.add_flag(5, 5, 5, TileFlag.HAS_STAIR_UP)
     grid.add_flag(5, 5, 6, TileFlag.HAS_STAIR_DOWN)
@@ -68,6 +92,14 @@ class TestSyncPathfinding:
         positions = {(p.x, p.y) for p in path}
         assert (10, 15) in positions
 
+    def test_path_around_wall_is_shortest(self, grid_with_wall):
+        start = Position(5, 5, 5)
+        goal = Position(15, 5, 5)
+        path = _find_path_sync(start, goal, grid_with_wall)
+        assert path is not None
+        # 5 right + 10 down to the gap, 5 right + 10 back up
+        assert len(path) == 31
+
     def test_no_path_to_unwalkable(self, flat_grid):
         start = Position(5, 5, 5)
         goal = Position(5, 5, 7)  # z=7 is not walkable
@@ -98,6 +130,15 @@ class TestSyncPathfinding:
         stair_from = z_changes[0][0]
         assert stair_from.x == 5 and stair_from.y == 5
 
+    def test_path_down_ramp(self):
+        grid = _make_flat_grid()
+        grid.flags[4] = FLOOR
+        grid.add_flag(3, 3, 5, TileFlag.HAS_RAMP)
+        path = _find_path_sync(Position(0, 0, 5), Position(0, 0, 4), grid)
+        assert path is not None
+        z_changes = [path[i] for i in range(len(path) - 1) if path[i].z != path[i + 1].z]
+        assert z_changes == [Position(3, 3, 5)]
+
     def test_max_iterations_limit(self, flat_grid):
         start = Position(0, 0, 5)
         goal = Position(19, 19, 5)
@@ -105,6 +146,14 @@ class TestSyncPathfinding:
         path = _find_path_sync(start, goal, flat_grid, max_iterations=5)
         assert path is None
 
+    def test_straight_run_is_one_jump(self, flat_grid):
+        """A straight open run costs a single expansion, not one per tile."""
+        start = Position(0, 5, 5)
+        goal = Position(19, 5, 5)
+        path = _find_path_sync(start, goal, flat_grid, max_iterations=2)
+        assert path is not None
+        assert len(path) == 20
+
     def test_path_is_contiguous(self, flat_grid):
         """Each step in the path should be adjacent to the previous."""
         start = Position(0, 0, 5)
@@ -145,3 +194,32 @@ class TestAsyncPathfinding:
             find_path(goal, start, flat_grid),
         )
         assert all(r is not None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_async_thread_depends_on_distance(self, flat_grid, search_threads):
+        near = await find_path(Position(0, 0, 5), Position(3, 0, 5), flat_grid)
+        far = await find_path(Position(0, 0, 5), Position(19, 19, 5), flat_grid)
+        assert near is not None and far is not None
+        assert search_threads[0] == threading.current_thread().name
+        assert search_threads[1].startswith("astar")
+
+
+class TestWarmUp:
+    def test_warm_up_compiles_every_kernel(self):
+        # Dispatchers only gain signatures once compiled or loaded from the
+        # disk cache, so check in a fresh interpreter
+        script = (
+            "from backend.ai import pathfinding\n"
+            "from backend.world import grid\n"
+            "kernels = (pathfinding._search, grid.planar_neighbors, grid.z_neighbors)\n"
+            "assert not any(k.signatures for k in kernels)\n"
+            "pathfinding.warm_up_kernels()\n"
+            "assert all(k.signatures for k in kernels)\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(__file__).parent.parent)
+
+    @pytest.mark.asyncio
+    async def test_near_search_uses_pool_until_compiled(self, flat_grid, search_threads, monkeypatch):
+        monkeypatch.setattr(pathfinding, "_search_compiled", lambda: False)
+        assert await find_path(Position(0, 0, 5), Position(3, 0, 5), flat_grid) is not None
+        assert search_threads[0].startswith("astar")
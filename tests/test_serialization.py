@@ -0,0 +1,80 @@
+"""Tests for world state serialization."""
+
+import numpy as np
+
+from backend.api.serialization import (
+    TILE_DELTA_HEADER,
+    Z_LEVEL_HEADER,
+    BinaryMessageType,
+    serialize_delta,
+    serialize_tile_delta_binary,
+    serialize_z_level_binary,
+)
+from backend.world.grid import WorldGrid
+from backend.world.tile import TileFlag, TileType
+
+
+class TestZLevelSerialization:
+    def test_binary_layout(self, small_grid):
+        small_grid.set_wall_type(3, 2, 5, TileType.STONE)
+        small_grid.set_floor_type(4, 1, 5, TileType.GRASS)
+        small_grid.set_flags(4, 1, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+
+        data = serialize_z_level_binary(small_grid, 5)
+        msg_type, z, width, height = Z_LEVEL_HEADER.unpack_from(data)
+        assert msg_type == BinaryMessageType.Z_LEVEL
+        assert (z, width, height) == (5, small_grid.width, small_grid.height)
+
+        size = width * height
+        offset = Z_LEVEL_HEADER.size
+        walls = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset)
+        floors = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset + size)
+        flags = np.frombuffer(data, dtype="<u2", count=size, offset=offset + 2 * size)
+        assert len(data) == offset + 4 * size
+        assert walls[2 * width + 3] == TileType.STONE
+        assert floors[1 * width + 4] == TileType.GRASS
+        assert flags[1 * width + 4] == TileFlag.WALKABLE | TileFlag.HAS_FLOOR
+
+    def test_flags_buffer_is_aligned(self):
+        # Clients view the flags as a Uint16Array, which needs an even offset.
+        # Odd dimensions give odd-length uint8 buffers ahead of the flags
+        grid = WorldGrid(width=3, height=5, depth=1)
+        grid.flags[0] = (np.arange(15, dtype=np.uint16) << 4).reshape(5, 3)
+        frame = serialize_z_level_binary(grid, 0)
+        offset = Z_LEVEL_HEADER.size + 2 * 3 * 5
+        assert Z_LEVEL_HEADER.size % 2 == 0 and TILE_DELTA_HEADER.size % 2 == 0
+        flags = np.frombuffer(frame, "<u2", count=15, offset=offset)
+        np.testing.assert_array_equal(flags, grid.flags[0].ravel())
+
+
+class TestDeltaSerialization:
+    def test_no_changes(self, small_grid):
+        assert serialize_tile_delta_binary(small_grid, np.empty(0, dtype=np.intp)) is None
+        assert serialize_delta() is None
+
+    def test_tile_arrays(self, small_grid):
+        small_grid.dig_tile(7, 8, 9)
+        small_grid.set_wall_type(1, 2, 3, TileType.STONE)
+        w, h = small_grid.width, small_grid.height
+        indices = np.array([(3 * h + 2) * w + 1, (9 * h + 8) * w + 7])
+        data = serialize_tile_delta_binary(small_grid, indices)
+        msg_type, count = TILE_DELTA_HEADER.unpack_from(data)
+        assert msg_type == BinaryMessageType.TILE_DELTA
+        assert count == 2
+        assert len(data) == TILE_DELTA_HEADER.size + 10 * count
+
+        offset = TILE_DELTA_HEADER.size
+        xs, ys, zs, flags = (
+            np.frombuffer(data, dtype="<u2", count=count, offset=offset + 2 * count * i)
+            for i in range(4)
+        )
+        walls = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset + 8 * count)
+        floors = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset + 9 * count)
+        assert list(zip(xs, ys, zs)) == [(1, 2, 3), (7, 8, 9)]
+        assert walls.tolist() == [TileType.STONE, TileType.AIR]
+        assert flags[1] == TileFlag.WALKABLE | TileFlag.HAS_FLOOR
+        assert floors.tolist() == [small_grid.floor_types[3, 2, 1], small_grid.floor_types[9, 8, 7]]
+
+    def test_creature_delta(self):
+        delta = serialize_delta(creatures=[{"id": 1}])
+        assert delta == {"type": "delta", "creatures": [{"id": 1}]}
@@ -0,0 +1,72 @@
+"""Tests for WebSocket connection management."""
+
+import json
+
+import pytest
+
+from backend.api.websocket import Z_LEVEL_CACHE_SIZE, ConnectionManager
+from backend.simulation.game_state import GameState
+from backend.world.grid import WorldGrid
+
+
+class TestZLevelCache:
+    def test_reuses_frame_until_tile_changes(self, small_grid):
+        state = GameState(small_grid)
+        manager = ConnectionManager()
+        manager.set_game_state(state)
+
+        first = manager._z_level_frame(state, 5)
+        assert manager._z_level_frame(state, 5) is first
+
+        small_grid.dig_tile(1, 1, 5)
+        state.mark_tile_changed(1, 1, 5)
+        fresh = manager._z_level_frame(state, 5)
+        assert fresh is not first
+        assert fresh != first
+
+    def test_change_on_other_level_keeps_cache(self, small_grid):
+        state = GameState(small_grid)
+        manager = ConnectionManager()
+        first = manager._z_level_frame(state, 5)
+        state.mark_tile_changed(1, 1, 6)
+        assert manager._z_level_frame(state, 5) is first
+
+    def test_cache_is_bounded(self):
+        state = GameState(WorldGrid(width=4, height=4, depth=Z_LEVEL_CACHE_SIZE + 4))
+        manager = ConnectionManager()
+        for z in range(state.world.depth):
+            manager._z_level_frame(state, z)
+        assert len(manager._z_level_cache) == Z_LEVEL_CACHE_SIZE
+
+
+class _FakeWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[str | bytes] = []
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+
+class TestBroadcast:
+    @pytest.mark.asyncio
+    async def test_json_goes_out_as_text(self):
+        manager = ConnectionManager()
+        ws = _FakeWebSocket()
+        manager.active_connections.append(ws)
+        message = {"type": "delta", "creatures": [{"id": 1, "hunger": 99.5, "alive": True}]}
+
+        await manager.broadcast(message)
+        assert len(ws.sent) == 1
+        assert isinstance(ws.sent[0], str)
+        assert json.loads(ws.sent[0]) == message
+
+    @pytest.mark.asyncio
+    async def test_bytes_go_out_as_binary(self):
+        manager = ConnectionManager()
+        ws = _FakeWebSocket()
+        manager.active_connections.append(ws)
+        await manager.broadcast_bytes(b"\x02\x00")
+        assert ws.sent == [b"\x02\x00"]
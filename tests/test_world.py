@@ -1,9 +1,13 @@
 """Tests for world grid, tiles, and world generation."""
 
+import random
+from enum import IntEnum
+
+import numpy as np
 import pytest
-from backend.world.grid import WorldGrid, Position
+from backend.world.grid import WorldGrid, Position, _members_by_value, planar_neighbors, z_neighbors
 from backend.world.tile import TileType, TileFlag
-from backend.world.worldgen import generate_world
+from backend.world.worldgen import _disk, _generate_terrain, _generate_water, generate_world
 from backend.config import SURFACE_Z
 
 
@@ -24,6 +28,17 @@ class TestPosition:
         assert hash(p1) == hash(p2)
         assert len({p1, p2}) == 1
 
+    def test_is_a_plain_tuple(self):
+        p = Position(1, 2, 3)
+        x, y, z = p
+        assert (x, y, z) == (1, 2, 3)
+        assert p == (1, 2, 3)
+        assert hash(p) == hash((1, 2, 3))
+
+    def test_has_no_instance_dict(self):
+        # Pathfinding builds one Position per path tile; keep them tuple-sized
+        assert not hasattr(Position(1, 2, 3), "__dict__")
+
     def test_manhattan_distance(self):
         p1 = Position(0, 0, 0)
         p2 = Position(3, 4, 5)
@@ -43,6 +58,22 @@ class TestWorldGrid:
         small_grid.set_wall_type(5, 5, 5, TileType.STONE)
         assert small_grid.get_wall_type(5, 5, 5) == TileType.STONE
 
+    def test_getters_return_enum_members(self, small_grid):
+        small_grid.set_wall_type(1, 1, 1, TileType.GOLD_ORE)
+        small_grid.set_flags(1, 1, 1, TileFlag.WALKABLE | TileFlag.DESIGNATED)
+        assert small_grid.get_wall_type(1, 1, 1) is TileType.GOLD_ORE
+        assert small_grid.get_floor_type(1, 1, 1) is TileType.AIR
+        flags = small_grid.get_flags(1, 1, 1)
+        assert isinstance(flags, TileFlag)
+        assert flags == TileFlag.WALKABLE | TileFlag.DESIGNATED
+
+    def test_members_by_value_allows_gaps(self):
+        class Sparse(IntEnum):
+            A = 1
+            B = 4
+
+        assert _members_by_value(Sparse) == (None, Sparse.A, None, None, Sparse.B)
+
     def test_set_get_floor_type(self, small_grid):
         small_grid.set_floor_type(3, 3, 3, TileType.GRANITE)
         assert small_grid.get_floor_type(3, 3, 3) == TileType.GRANITE
@@ -53,15 +84,20 @@ class TestWorldGrid:
         assert small_grid.has_flag(1, 1, 1, TileFlag.HAS_FLOOR)
         assert not small_grid.has_flag(1, 1, 1, TileFlag.DIGGABLE)
 
+    def test_count_flag(self, small_grid):
+        small_grid.flags[3, 0, :4] = TileFlag.WALKABLE.value
+        small_grid.add_flag(0, 0, 7, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+        assert small_grid.count_flag(TileFlag.WALKABLE, z=3) == 4
+        assert small_grid.count_flag(TileFlag.WALKABLE) == 5
+        assert small_grid.count_flag(TileFlag.HAS_FLOOR) == 1
+
     def test_add_remove_flag(self, small_grid):
         small_grid.set_flags(2, 2, 2, TileFlag.WALKABLE)
         small_grid.add_flag(2, 2, 2, TileFlag.HAS_FLOOR)
-        assert small_grid.has_flag(2, 2, 2, TileFlag.WALKABLE)
-        assert small_grid.has_flag(2, 2, 2, TileFlag.HAS_FLOOR)
+        assert small_grid.get_flags(2, 2, 2) == TileFlag.WALKABLE | TileFlag.HAS_FLOOR
 
         small_grid.remove_flag(2, 2, 2, TileFlag.WALKABLE)
-        assert not small_grid.has_flag(2, 2, 2, TileFlag.WALKABLE)
-        assert small_grid.has_flag(2, 2, 2, TileFlag.HAS_FLOOR)
+        assert small_grid.get_flags(2, 2, 2) == TileFlag.HAS_FLOOR
 
     def test_is_walkable(self, small_grid):
         assert not small_grid.is_walkable(0, 0, 0)
@@ -72,14 +108,33 @@ class TestWorldGrid:
         assert not small_grid.is_walkable(-1, 0, 0)
         assert not small_grid.is_walkable(100, 0, 0)
 
+    def test_tile_arrays_are_contiguous(self, small_grid):
+        # The pathfinding kernel and z-level serialization scan these arrays
+        # plane by plane and row by row
+        for array in (small_grid.flags, small_grid.wall_types, small_grid.floor_types):
+            assert array.flags.c_contiguous
+
+    def test_walk_mask_tracks_flag_setters(self, small_grid):
+        assert not small_grid.walk_mask[3, 2, 1]
+        small_grid.add_flag(1, 2, 3, TileFlag.WALKABLE)
+        assert small_grid.walk_mask[3, 2, 1]
+        small_grid.remove_flag(1, 2, 3, TileFlag.WALKABLE)
+        assert not small_grid.walk_mask[3, 2, 1]
+
+    def test_walk_mask_invalidate(self, small_grid):
+        assert not small_grid.walk_mask[0].any()
+        small_grid.flags[0, :, :] = TileFlag.WALKABLE.value
+        small_grid.invalidate_walk_mask()
+        assert small_grid.walk_mask[0].all()
+
     def test_get_neighbors_2d(self, small_grid):
         # Make a walkable cross pattern at z=5
-        for x, y in [(5, 5), (4, 5), (6, 5), (5, 4), (5, 6)]:
-            small_grid.add_flag(x, y, 5, TileFlag.WALKABLE)
+        small_grid.flags[5, 5, 4:7] = TileFlag.WALKABLE.value
+        small_grid.flags[5, 4:7, 5] = TileFlag.WALKABLE.value
 
         neighbors = small_grid.get_neighbors_2d(5, 5, 5)
-        positions = {(n.x, n.y, n.z) for n in neighbors}
-        assert positions == {(4, 5, 5), (6, 5, 5), (5, 4, 5), (5, 6, 5)}
+        # Positions are tuples, so they sort and compare as plain (x, y, z)
+        assert sorted(neighbors) == [(4, 5, 5), (5, 4, 5), (5, 6, 5), (6, 5, 5)]
 
     def test_get_neighbors_3d_stairs(self, small_grid):
         # Set up stair connection between z=5 and z=6
@@ -92,18 +147,55 @@ class TestWorldGrid:
             TileFlag.WALKABLE | TileFlag.HAS_FLOOR | TileFlag.HAS_STAIR_DOWN,
         )
 
-        neighbors = small_grid.get_neighbors_3d(5, 5, 5)
-        positions = {(n.x, n.y, n.z) for n in neighbors}
-        assert (5, 5, 6) in positions
-
+        assert (5, 5, 6) in small_grid.get_neighbors_3d(5, 5, 5)
         # Going down from z=6
-        neighbors_down = small_grid.get_neighbors_3d(5, 5, 6)
-        positions_down = {(n.x, n.y, n.z) for n in neighbors_down}
-        assert (5, 5, 5) in positions_down
+        assert (5, 5, 5) in small_grid.get_neighbors_3d(5, 5, 6)
+
+    def test_get_neighbors_2d_at_corner(self, small_grid):
+        small_grid.flags[5, :, :] = TileFlag.WALKABLE.value
+        assert sorted(small_grid.get_neighbors_2d(0, 0, 5)) == [(0, 1, 5), (1, 0, 5)]
+
+    def test_get_neighbors_3d_ramp(self, small_grid):
+        small_grid.set_flags(5, 5, 6, TileFlag.WALKABLE | TileFlag.HAS_RAMP)
+        small_grid.set_flags(5, 5, 5, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+        assert small_grid.get_neighbors_3d(5, 5, 6) == [Position(5, 5, 5)]
+        # Ramps only lead down
+        assert small_grid.get_neighbors_3d(5, 5, 5) == []
+
+    def test_get_neighbors_out_of_bounds(self, small_grid):
+        small_grid.flags[5, :, :] = TileFlag.WALKABLE.value
+        small_grid.set_flags(4, 6, 5, TileFlag.WALKABLE | TileFlag.HAS_STAIR_UP)
+        small_grid.set_flags(4, 6, 6, TileFlag.WALKABLE | TileFlag.HAS_STAIR_DOWN)
+        # x=16 is one past the edge; its west neighbor would be on the grid
+        for x, y, z in [(100, 0, 5), (16, 6, 5), (4, 6, -1), (5, 5, 40000)]:
+            assert small_grid.get_neighbors_2d(x, y, z) == []
+            assert small_grid.get_neighbors_3d(x, y, z) == []
+
+    def test_neighbor_kernels_share_buffer(self, small_grid):
+        small_grid.flags[5, 4:7, 4:7] = TileFlag.WALKABLE.value
+        small_grid.add_flag(5, 5, 5, TileFlag.HAS_RAMP)
+        small_grid.set_flags(5, 5, 4, TileFlag.WALKABLE | TileFlag.HAS_FLOOR)
+        out = np.full((6, 3), -1, dtype=np.int64)
+        n = planar_neighbors(small_grid.flags, 5, 5, 5, out)
+        assert n == 4
+        n = z_neighbors(small_grid.flags, 5, 5, 5, out, n)
+        assert n == 5
+        assert out[4].tolist() == [5, 5, 4]
+        assert out[5].tolist() == [-1, -1, -1]
 
     def test_get_tiles_in_rect(self, small_grid):
         tiles = small_grid.get_tiles_in_rect(2, 3, 4, 5, 0)
-        assert len(tiles) == 9  # 3x3
+        assert tiles.shape == (9, 3)  # 3x3
+        assert tiles.dtype == np.int32
+        assert tiles[0].tolist() == [2, 3, 0]
+        assert tiles[-1].tolist() == [4, 5, 0]
+
+    def test_get_tiles_in_rect_clips_to_grid(self, small_grid):
+        tiles = small_grid.get_tiles_in_rect(14, 1, 20, -3, 2)
+        assert tiles.shape == (2 * 2, 3)
+        assert {tuple(t) for t in tiles.tolist()} == {(14, 0, 2), (15, 0, 2), (14, 1, 2), (15, 1, 2)}
+        assert len(small_grid.get_tiles_in_rect(20, 0, 30, 5, 2)) == 0
+        assert len(small_grid.get_tiles_in_rect(0, 0, 5, 5, 99)) == 0
 
     def test_dig_tile(self, small_grid):
         small_grid.set_wall_type(5, 5, 5, TileType.STONE)
@@ -124,6 +216,24 @@ class TestWorldGrid:
         assert small_grid.has_flag(5, 5, 5, TileFlag.HAS_STAIR_UP)
         assert small_grid.has_flag(5, 5, 5, TileFlag.HAS_STAIR_DOWN)
 
+    def test_dig_tiles_matches_dig_tile(self, small_grid):
+        other = WorldGrid(width=16, height=16, depth=16)
+        for grid in (small_grid, other):
+            grid.wall_types[5:7] = TileType.STONE
+            grid.wall_types[6, 2, 2] = TileType.AIR
+            assert not grid.walk_mask[5].any()
+        mask = np.zeros((16, 16), dtype=bool)
+        mask[1:4, 1:4] = True
+
+        small_grid.dig_tiles(mask, 5)
+        for y, x in zip(*np.nonzero(mask)):
+            other.dig_tile(int(x), int(y), 5)
+
+        assert np.array_equal(small_grid.wall_types, other.wall_types)
+        assert np.array_equal(small_grid.flags, other.flags)
+        assert small_grid.has_flag(2, 2, 6, TileFlag.HAS_FLOOR)
+        assert np.array_equal(small_grid.walk_mask[5], mask)
+
     def test_channel_tile(self, small_grid):
         small_grid.set_wall_type(5, 5, 5, TileType.STONE)
         small_grid.set_wall_type(5, 5, 4, TileType.STONE)
@@ -136,6 +246,21 @@ class TestWorldGrid:
         assert small_grid.has_flag(5, 5, 4, TileFlag.HAS_RAMP)
 
 
+@pytest.fixture(scope="session")
+def surface_world():
+    """Shared read-only 32x32 world cut off one z-level above the surface.
+
+    Generation is deterministic per seed.
+    """
+    return generate_world(width=32, height=32, depth=SURFACE_Z + 2, seed=42)
+
+
+@pytest.fixture(scope="session")
+def large_world():
+    """Shared read-only 64x64x48 world, big enough for ores, caverns and pools."""
+    return generate_world(width=64, height=64, depth=48, seed=42)
+
+
 class TestWorldGen:
     def test_generates_valid_terrain(self):
         world = generate_world(width=32, height=32, depth=32, seed=42)
@@ -143,59 +268,92 @@ class TestWorldGen:
         assert world.height == 32
         assert world.depth == 32
 
-    def test_surface_is_grass(self):
-        world = generate_world(width=32, height=32, depth=48, seed=42)
+    def test_terrain_layers(self):
+        grid = WorldGrid(width=8, height=8, depth=SURFACE_Z + 3)
+        _generate_terrain(grid)
+        assert (grid.wall_types[SURFACE_Z + 1:] == TileType.AIR).all()
+        assert (grid.flags[SURFACE_Z] == TileFlag.WALKABLE | TileFlag.HAS_FLOOR).all()
+        assert (grid.wall_types[SURFACE_Z - 3:SURFACE_Z] == TileType.SOIL).all()
+        assert (grid.wall_types[:SURFACE_Z - 3] == TileType.STONE).all()
+        assert (grid.flags[:SURFACE_Z] == TileFlag.DIGGABLE).all()
+
+    def test_bulk_writes_keep_walk_mask_in_sync(self):
+        grid = WorldGrid(width=32, height=32, depth=SURFACE_Z + 2)
+        assert not grid.walk_mask.any()  # Build the mask before generating
+        _generate_terrain(grid)
+        np.testing.assert_array_equal(grid.walk_mask, (grid.flags & TileFlag.WALKABLE.value) != 0)
+        _generate_water(grid, np.random.default_rng(42))
+        assert (grid.wall_types[SURFACE_Z] == TileType.WATER).any()
+        np.testing.assert_array_equal(grid.walk_mask, (grid.flags & TileFlag.WALKABLE.value) != 0)
+
+    def test_surface_is_grass(self, surface_world):
         # Surface at SURFACE_Z should have grass floor
-        grass_count = 0
-        for y in range(world.height):
-            for x in range(world.width):
-                if world.get_floor_type(x, y, SURFACE_Z) == TileType.GRASS:
-                    grass_count += 1
+        grass_count = np.count_nonzero(surface_world.floor_types[SURFACE_Z] == TileType.GRASS)
         # Most surface tiles should be grass (some may be water)
-        assert grass_count > world.width * world.height * 0.8
+        assert grass_count > surface_world.width * surface_world.height * 0.8
 
-    def test_surface_is_walkable(self):
-        world = generate_world(width=32, height=32, depth=48, seed=42)
+    def test_surface_is_walkable(self, surface_world):
         # Surface z-level should be walkable
-        walkable_count = 0
-        for y in range(world.height):
-            for x in range(world.width):
-                if world.is_walkable(x, y, SURFACE_Z):
-                    walkable_count += 1
-        assert walkable_count > 0
-
-    def test_underground_is_stone(self):
-        world = generate_world(width=32, height=32, depth=48, seed=42)
+        assert surface_world.count_flag(TileFlag.WALKABLE, z=SURFACE_Z) > 0
+
+    def test_underground_is_stone(self, surface_world):
         # Deep underground should be stone (or ore)
-        stone_like = {TileType.STONE, TileType.IRON_ORE, TileType.COPPER_ORE, TileType.GOLD_ORE}
-        stone_count = 0
+        stone_like = [TileType.STONE, TileType.IRON_ORE, TileType.COPPER_ORE, TileType.GOLD_ORE]
         z = 5  # Deep underground
-        for y in range(world.height):
-            for x in range(world.width):
-                wt = world.get_wall_type(x, y, z)
-                if wt in stone_like:
-                    stone_count += 1
+        stone_count = np.count_nonzero(np.isin(surface_world.wall_types[z], stone_like))
         # Most deep tiles should be stone-like (caverns may have dug-out areas)
-        total = world.width * world.height
+        total = surface_world.width * surface_world.height
         assert stone_count > total * 0.5
 
-    def test_deterministic_with_seed(self):
-        world1 = generate_world(width=16, height=16, depth=32, seed=123)
-        world2 = generate_world(width=16, height=16, depth=32, seed=123)
+    def test_deterministic_with_seed(self, surface_world):
+        # Regenerating the shared world must reproduce it exactly
+        world = generate_world(width=32, height=32, depth=SURFACE_Z + 2, seed=42)
 
-        import numpy as np
-        assert np.array_equal(world1.wall_types, world2.wall_types)
-        assert np.array_equal(world1.floor_types, world2.floor_types)
-        assert np.array_equal(world1.flags, world2.flags)
+        np.testing.assert_array_equal(world.wall_types, surface_world.wall_types)
+        np.testing.assert_array_equal(world.floor_types, surface_world.floor_types)
+        np.testing.assert_array_equal(world.flags, surface_world.flags)
 
-    def test_ores_exist(self):
-        world = generate_world(width=64, height=64, depth=48, seed=42)
+    def test_ores_exist(self, large_world):
         ore_types = {TileType.IRON_ORE, TileType.COPPER_ORE, TileType.GOLD_ORE}
-        found_ores = set()
-        for z in range(SURFACE_Z):
-            for y in range(world.height):
-                for x in range(world.width):
-                    wt = world.get_wall_type(x, y, z)
-                    if wt in ore_types:
-                        found_ores.add(wt)
-        assert len(found_ores) == 3  # All three ore types should be present
+        present = set(np.unique(large_world.wall_types[:SURFACE_Z]).tolist())
+        assert ore_types <= present  # All three ore types should be present
+
+    def test_ores_only_replace_stone(self):
+        world = generate_world(width=64, height=64, depth=48, seed=7)
+        ores = np.isin(world.wall_types, [TileType.IRON_ORE, TileType.COPPER_ORE, TileType.GOLD_ORE])
+        assert ores.any()
+        # Ore keeps the stone floor it replaced
+        assert (world.floor_types[ores] == TileType.STONE).all()
+
+    def test_caverns_are_walkable(self, large_world):
+        for z in (15, 8):
+            dug = large_world.wall_types[z] == TileType.AIR
+            assert dug.any()
+            assert (large_world.flags[z][dug] == TileFlag.WALKABLE | TileFlag.HAS_FLOOR).all()
+
+    def test_water_pools_are_not_walkable(self, large_world):
+        water = large_world.wall_types[SURFACE_Z] == TileType.WATER
+        assert water.any()
+        assert (large_world.floor_types[SURFACE_Z][water] == TileType.WATER).all()
+        assert (large_world.flags[SURFACE_Z][water] == TileFlag.HAS_FLOOR).all()
+
+    def test_seed_does_not_touch_global_rng(self):
+        random.seed(0)
+        expected = random.random()
+        random.seed(0)
+        generate_world(width=32, height=32, depth=48, seed=42)
+        assert random.random() == expected
+
+    def test_different_seeds_differ(self):
+        world1 = generate_world(width=64, height=64, depth=48, seed=1)
+        world2 = generate_world(width=64, height=64, depth=48, seed=2)
+        assert not np.array_equal(world1.wall_types, world2.wall_types)
+
+    def test_disk_clips_cached_mask_at_edges(self):
+        grid = WorldGrid(8, 8, 1)
+        ys, xs, mask = _disk(grid, 0, 7, (-2, 2), (-2, 2), 4)
+        assert (ys, xs) == (slice(5, 8), slice(0, 3))
+        expected = np.array([[1, 0, 0], [1, 1, 0], [1, 1, 1]], bool)
+        np.testing.assert_array_equal(mask, expected)
+        # Same shape again hits the cache; the shared mask must stay read-only
+        assert not _disk(grid, 4, 4, (-2, 2), (-2, 2), 4)[2].flags.writeable